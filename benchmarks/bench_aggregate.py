@@ -0,0 +1,162 @@
+"""The per-match loop the dashboard first aggregated matches with vs aggregate_matches.
+
+    python benchmarks/bench_aggregate.py                     # real sheet + ~100k synthetic rounds
+    python benchmarks/bench_aggregate.py --matches 400 --repeat 3
+
+legacy_aggregate_matches is the old load_and_aggregate_matches body (minus the CSV
+read). Both run from the same raw round sheet: the real one, and a synthetic one
+with its rows shuffled. Their match tables must be equal row for row, once Date and
+Tier get the post-processing the dashboard applies, and in the same order: the
+loop's (one row per match, in order of first appearance) stably sorted by Date with
+missing dates last, as the tables are kept date-sorted. The loop is slow (about a
+minute at 100k rounds), so it runs once; the vectorized path is best of --repeat.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_SHEET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Advanced_Data-_Sheet1.csv")
+
+
+# ── Legacy implementation ──────────────────────────────────────────────────────
+def legacy_aggregate_matches(raw):
+    raw = raw.copy()
+    raw.columns = raw.columns.str.strip()
+    for col in ['Result', 'Side', 'Site', 'Plant XvY', 'Pistol']:
+        if col in raw.columns:
+            raw[col] = raw[col].astype(str).str.strip().replace('nan', '')
+
+    records = []
+    for (map_name, team, date), match in raw.groupby(['Map', 'Team', 'Date'], sort=False):
+        match = match.sort_values('Round').reset_index(drop=True)
+        tier = match['Tier'].dropna().iloc[0] if 'Tier' in match.columns and match['Tier'].notna().any() else None
+
+        r1  = match[match['Round'] == 1].iloc[0]  if len(match[match['Round'] == 1])  > 0 else None
+        r13 = match[match['Round'] == 13].iloc[0] if len(match[match['Round'] == 13]) > 0 else None
+        first_pistol  = 1 if (r1  is not None and r1['Result'].lower()  == 'win') else 0
+        second_pistol = 1 if (r13 is not None and r13['Result'].lower() == 'win') else 0
+        start_side    = r1['Side'] if r1 is not None else None
+
+        first_half  = match[match['Round'] <= 12]
+        second_half = match[match['Round'] >= 13]
+        first_rounds_won  = (first_half['Result'].str.lower()  == 'win').sum()
+        second_rounds_won = (second_half['Result'].str.lower() == 'win').sum()
+        first_half_wr  = round(first_rounds_won  / len(first_half),  2) if len(first_half)  > 0 else None
+        second_half_wr = round(second_rounds_won / len(second_half), 2) if len(second_half) > 0 else None
+
+        def conversion(pistol_won, round_num):
+            r = match[match['Round'] == round_num]
+            if len(r) == 0:
+                return None
+            won = r.iloc[0]['Result'].lower() == 'win'
+            if pistol_won:
+                return 'WW' if won else 'WL'
+            else:
+                return 'LW' if won else 'LL'
+
+        if start_side == 'Attack':
+            atk_2nd = conversion(first_pistol,  2)
+            def_2nd = conversion(second_pistol, 14)
+        else:
+            def_2nd = conversion(first_pistol,  2)
+            atk_2nd = conversion(second_pistol, 14)
+
+        planted    = match[(match['Time at Plant'].notna()) & (match['Time at Plant'].astype(str).str.strip() != '')]
+        atk_plants = planted[planted['Side'] == 'Attack']
+        def_plants = planted[planted['Side'] == 'Defence']
+        atk_pp = round((atk_plants['Result'].str.lower() == 'win').sum() / len(atk_plants), 2) if len(atk_plants) > 0 else 0
+        def_pp = round((def_plants['Result'].str.lower() == 'win').sum() / len(def_plants), 2) if len(def_plants) > 0 else 0
+
+        site_pp = {}
+        for site in ['A', 'B', 'C']:
+            s_atk = atk_plants[atk_plants['Site'] == site]
+            s_def = def_plants[def_plants['Site'] == site]
+            site_pp[f'Atk_PP_{site}'] = round((s_atk['Result'].str.lower() == 'win').sum() / len(s_atk), 2) if len(s_atk) > 0 else None
+            site_pp[f'Def_PP_{site}'] = round((s_def['Result'].str.lower() == 'win').sum() / len(s_def), 2) if len(s_def) > 0 else None
+
+        total_won  = (match['Result'].str.lower() == 'win').sum()
+        total_lost = (match['Result'].str.lower() == 'loss').sum()
+        outcome = 'Win' if total_won > total_lost else 'Loss' if total_lost > total_won else 'Draw'
+
+        records.append({
+            'Date': date, 'Map': map_name, 'Team': team, 'Start': start_side,
+            'First Pistol': first_pistol, 'First Rounds': first_rounds_won, 'First Half WR': first_half_wr,
+            'Second Pistol': second_pistol, 'Second Rounds': second_rounds_won, 'Second Half WR': second_half_wr,
+            'Atk_PP_Success': atk_pp, 'Def_PP_Success': def_pp,
+            **site_pp,
+            'Atk 2nd': atk_2nd, 'Def 2nd': def_2nd,
+            'Outcome': outcome, 'Tier': tier,
+        })
+
+    out = pd.DataFrame(records)
+    col_order = [
+        'Date', 'Map', 'Team', 'Start',
+        'First Pistol', 'First Rounds', 'First Half WR',
+        'Second Pistol', 'Second Rounds', 'Second Half WR',
+        'Atk_PP_Success', 'Def_PP_Success',
+        'Atk_PP_A', 'Atk_PP_B', 'Atk_PP_C',
+        'Def_PP_A', 'Def_PP_B', 'Def_PP_C',
+        'Atk 2nd', 'Def 2nd', 'Outcome', 'Tier'
+    ]
+    out = out[[c for c in col_order if c in out.columns]]
+    return out
+
+
+# ── Harness ────────────────────────────────────────────────────────────────────
+def vectorized(raw):
+    return sa.aggregate_matches(sa.normalize_rounds(raw.copy()))
+
+
+def comparable(matches):
+    """`matches` with the dashboard's Date / Tier post-processing and plain dtypes, rows kept in order."""
+    out = matches.reset_index(drop=True)
+    out['Date'] = pd.to_datetime(out['Date'], errors='coerce', format='mixed')
+    out['Tier'] = pd.to_numeric(out['Tier'], errors='coerce').fillna(1).astype(int)
+    return out.astype({c: object for c in out.columns if c not in ('Date', 'Tier')})
+
+
+def match_keys(matches):
+    return list(zip(matches['Map'].astype(str), matches['Team'].astype(str), matches['Date'].astype(str)))
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=4_200, help="synthetic matches (4,200 ≈ 100k rounds)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_agg_") as folder:
+        synthetic = pd.read_csv(write_scrims(folder, args.matches)['rounds'])
+    sheets = {"real sheet": pd.read_csv(REAL_SHEET), "synthetic": synthetic.sample(frac=1, random_state=0, ignore_index=True)}
+
+    print(f"{'':<14}{'rounds':>9}{'matches':>9}{'loop s':>9}{'vector s':>10}{'speed-up':>10}  output")
+    for name, raw in sheets.items():
+        t_old, old = best_of(lambda: legacy_aggregate_matches(raw), 1)
+        t_new, new = best_of(lambda: vectorized(raw), args.repeat)
+        old, new = comparable(old), comparable(new[old.columns])
+        old = old.sort_values('Date', kind='stable', na_position='last', ignore_index=True)
+        assert match_keys(new) == match_keys(old), f"{name}: matches not in the loop's order, sorted by date"
+        pd.testing.assert_frame_equal(old, new, check_dtype=False)
+        print(f"{name:<14}{len(raw):>9,}{len(new):>9,}{t_old:>9.2f}{t_new:>10.3f}{t_old / t_new:>9.0f}×  equal")
+
+
+if __name__ == "__main__":
+    main()
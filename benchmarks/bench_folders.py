@@ -0,0 +1,95 @@
+"""Loading a folder of per-day exports with 1, 2, 4 … worker processes.
+
+    python benchmarks/bench_folders.py                       # 100× the real sheet, one file per day
+    python benchmarks/bench_folders.py --scale 1000 --workers 1 2 4 8 16
+
+The synthetic round sheet, form.csv and foracs.csv are split into one file per
+scrim day. Each worker count is timed cold (no per-file cache entries, so every
+file is parsed and aggregated) and warm (every file cached), best of --repeat,
+and checked against reading the days pasted together as single sheets.
+Speed-ups are relative to one worker, which loads in this process.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics import folders  # noqa: E402
+from scrim_analytics.cache import CACHE_DIR  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66
+
+
+def split_by_day(path, folder, prefix):
+    """Write `path`'s rows as one CSV per date under `folder`; returns the day files in name order."""
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    days = pd.to_datetime(raw['Date'], errors='coerce', format='mixed').dt.strftime('%Y-%m-%d').fillna('undated')
+    for day, rows in raw.groupby(days, sort=True):
+        rows.to_csv(os.path.join(folder, f"{day}_{prefix}.csv"), index=False)
+    return sorted(os.path.join(folder, f"{day}_{prefix}.csv") for day in days.unique())
+
+
+def paste(files, target):
+    """The day files one after another as a single sheet."""
+    pd.concat([pd.read_csv(f, dtype=str, keep_default_na=False) for f in files]).to_csv(target, index=False)
+    return target
+
+
+def best_of(fn, repeat, before=None):
+    best = float('inf')
+    for _ in range(repeat):
+        if before:
+            before()
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="multiple of the real sheet's match count")
+    parser.add_argument("--days", type=int, default=365, help="calendar span, so about this many files per kind")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, folders.available_cpus()}))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_folder_") as workdir:
+        paths = write_scrims(os.path.join(workdir, "src"), REAL_MATCHES * args.scale, days=args.days)
+        exports, pasted = os.path.join(workdir, "exports"), os.path.join(workdir, "pasted")
+        os.makedirs(exports)
+        os.makedirs(pasted)
+        sheets = {kind: paste(split_by_day(paths[kind], exports, kind), os.path.join(pasted, f"{kind}.csv"))
+                  for kind in ('rounds', 'form', 'foracs')}
+        print(f"{REAL_MATCHES * args.scale:,} matches in {len(os.listdir(exports))} files; "
+              f"{folders.available_cpus()} CPU(s) available")
+
+        rounds = sa.read_rounds(sheets['rounds'])
+        expected = {'rounds': rounds, 'matches': sa.read_matches(sheets['rounds'], rounds=rounds),
+                    'form': sa.read_player_form(sheets['form']), 'foracs': sa.read_acs(sheets['foracs'])}
+
+        def clear():
+            shutil.rmtree(os.path.join(exports, CACHE_DIR), ignore_errors=True)
+
+        print(f"\n{'workers':>7}{'cold s':>9}{'speed-up':>10}{'warm s':>9}{'speed-up':>10}")
+        base = None
+        for workers in args.workers:
+            t_cold, got = best_of(lambda: folders.read_folder(exports, workers), args.repeat, before=clear)
+            t_warm, _ = best_of(lambda: folders.read_folder(exports, workers), args.repeat)
+            for name, table in expected.items():
+                pd.testing.assert_frame_equal(got[name], table, check_dtype=False)
+            base = base or (t_cold, t_warm)
+            print(f"{workers:>7}{t_cold:>9.2f}{base[0] / t_cold:>9.1f}×{t_warm:>9.2f}{base[1] / t_warm:>9.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Resident size of the loaded tables vs the plain `pd.read_csv` frames they come from.
+
+    python benchmarks/bench_memory.py                  # 1×, 10×, 100× the real sheet
+    python benchmarks/bench_memory.py --scale 1000
+
+Sizes are deep `memory_usage` (strings counted in full), per table, with the ratio
+to the untyped frame: what every session shares once the caches are warm.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66
+
+
+def tables(paths):
+    """({name: raw frame}, {name: loaded table}) for the three CSVs, plus the matches built from the rounds."""
+    raw = {'rounds': pd.read_csv(paths['rounds']), 'form': pd.read_csv(paths['form']),
+           'foracs': pd.read_csv(paths['foracs'])}
+    rounds = sa.normalize_rounds(raw['rounds'].copy())
+    loaded = {'rounds': rounds, 'form': sa.normalize_player_form(raw['form'].copy()),
+              'foracs': sa.normalize_acs(raw['foracs'].copy())}
+    loaded['matches'] = sa.aggregate_matches(rounds)  # no CSV of its own, so no ratio
+    return raw, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                        help="multiples of the real sheet's match count")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_mem_") as workdir:
+        for scale in args.scale:
+            paths = write_scrims(os.path.join(workdir, f"x{scale}"), REAL_MATCHES * scale)
+            raw, loaded = tables(paths)
+            print(f"\n── {scale}× ({REAL_MATCHES * scale} matches) " + "─" * 40)
+            print(sa.memory_report(loaded, before=raw).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
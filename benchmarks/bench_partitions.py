@@ -0,0 +1,86 @@
+"""Partition-pruned scans vs loading a roster's whole history, on several rosters × seasons.
+
+    python benchmarks/bench_partitions.py                        # 4 rosters × 2 seasons
+    python benchmarks/bench_partitions.py --rosters 8 --matches 20000
+
+Every roster gets its own synthetic sheets spanning --days from 2025-01-01, ingested
+into one store. The query is the sidebar's most common one: the last 30 days of a
+roster's Tier 1 scrims. Each way is checked for equal output and timed (best of
+--repeat); the partition counts show how much of the store the scan touched.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics import partitions  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rosters", type=int, default=4)
+    parser.add_argument("--matches", type=int, default=6600, help="matches per roster")
+    parser.add_argument("--days", type=int, default=730, help="calendar span per roster (two seasons by default)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="scrim_parts_")
+    try:
+        root = os.path.join(workdir, "store")
+        sources = {}
+        t = time.perf_counter()
+        for i in range(args.rosters):
+            roster = f"Roster {i}"
+            sources[roster] = write_scrims(os.path.join(workdir, f"r{i}"), args.matches, start=date(2025, 1, 1),
+                                           days=args.days, seed=i)
+            partitions.ingest(root, roster, **sources[roster])
+        print(f"ingested {args.rosters} rosters × {args.matches:,} matches in {time.perf_counter() - t:.1f}s")
+
+        roster, tiers = "Roster 0", (1,)
+        end = date(2025, 1, 1) + timedelta(days=args.days - 1)
+        start = end - timedelta(days=30)
+        paths = sources[roster]
+        queries = [
+            ("matches", lambda: sa.select_matches(sa.read_matches(paths['rounds']), tiers, start, end),
+                        lambda: sa.select_matches(partitions.scan_partitions(root, 'matches', roster, tiers, start, end),
+                                                  tiers, start, end)),
+            ("rounds",  lambda: sa.select_rounds(sa.read_rounds(paths['rounds']), tiers, start, end),
+                        lambda: sa.select_rounds(partitions.scan_partitions(root, 'rounds', roster, tiers, start, end),
+                                                 tiers, start, end)),
+            ("form",    lambda: sa.date_slice(sa.read_player_form(paths['form']), start, end),
+                        lambda: sa.date_slice(partitions.scan_partitions(root, 'form', roster, None, start, end), start, end)),
+        ]
+        print(f"\nquery: {roster}, tiers {tiers}, {start} … {end}")
+        print(f"{'dataset':<10}{'rows':>8}{'parts read':>12}{'full load ms':>14}{'pruned ms':>11}{'speed-up':>10}")
+        for dataset, full, pruned in queries:
+            entries = partitions.read_manifest(root, dataset)
+            kept = partitions.prune_partitions(entries, roster, tiers if dataset != 'form' else None, start, end)
+            t_full, expected = best_of(full, args.repeat)
+            t_pruned, got = best_of(pruned, args.repeat)
+            pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True))
+            print(f"{dataset:<10}{len(got):>8,}{f'{len(kept)}/{len(entries)}':>12}"
+                  f"{t_full * 1000:>14.1f}{t_pruned * 1000:>11.1f}{t_full / t_pruned:>9.1f}×")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
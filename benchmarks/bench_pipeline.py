@@ -0,0 +1,155 @@
+"""Time every dashboard stage on synthetic scrim data at several scales.
+
+    python benchmarks/bench_pipeline.py                 # 1×, 10×, 100× the real sheet
+    python benchmarks/bench_pipeline.py --scale 1 1000 --repeat 5 --json bench.json
+
+Each stage is timed with perf_counter (best of --repeat) and then run once more
+under tracemalloc for its peak allocation. Throughput is source rows per second.
+Save a --json run before a change and pass it as --baseline afterwards to see
+the ratio per stage.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66  # matches in the current round sheet; --scale multiplies this
+
+
+def measure(fn, repeat):
+    """(best seconds, peak bytes, result) for `fn()`."""
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def stages(paths):
+    """(name, source rows, fn) for every stage, in pipeline order; later fns reuse earlier results."""
+    out = {}
+
+    def keep(name, fn):
+        def run():
+            out[name] = fn()
+            return out[name]
+        return run
+
+    def clear_disk_cache():
+        shutil.rmtree(os.path.join(os.path.dirname(paths['rounds']), sa.CACHE_DIR), ignore_errors=True)
+
+    def cold_matches():
+        clear_disk_cache()
+        return sa.read_matches(paths['rounds'])
+
+    n_rounds = sum(1 for _ in open(paths['rounds'])) - 1
+    n_form   = sum(1 for _ in open(paths['form'])) - 1
+    tiers    = (1, 2, 3)
+
+    def date_filters():
+        # A fortnight from the middle of the calendar, as the tabs' date pickers would ask for.
+        dates = out['matches']['Date'].dropna()
+        start = (dates.min() + (dates.max() - dates.min()) / 2).date()
+        end   = start + pd.Timedelta(days=14)
+        return (sa.select_matches(out['matches'], tiers, start, end), sa.select_rounds(out['rounds'], tiers, start, end),
+                [sa.select_player_rows(out['form'], p, start, end) for p in out['form']['Player'].dropna().unique()])
+
+    return [
+        ("csv: round sheet",          n_rounds, keep('raw_rounds', lambda: pd.read_csv(paths['rounds']))),
+        ("csv: form",                 n_form,   keep('raw_form',   lambda: pd.read_csv(paths['form']))),
+        ("csv: foracs",               n_form,   lambda: pd.read_csv(paths['foracs'])),
+        ("normalize_rounds",          n_rounds, keep('rounds', lambda: sa.normalize_rounds(out['raw_rounds'].copy()))),
+        ("aggregate_matches",         n_rounds, lambda: sa.aggregate_matches(out['rounds'])),
+        ("read_matches (cold cache)", n_rounds, cold_matches),
+        ("read_matches (warm cache)", n_rounds, keep('matches', lambda: sa.read_matches(paths['rounds']))),
+        ("normalize_player_form",     n_form,   keep('form', lambda: sa.normalize_player_form(out['raw_form'].copy()))),
+        ("build_composition_index",   n_form,   keep('comps', lambda: sa.build_composition_index(out['form'], out['matches']))),
+        ("date-range filters",        n_rounds, date_filters),
+        ("overview summaries",        n_rounds, lambda: (sa.map_outcome_summary(sa.select_matches(out['matches'], tiers)),
+                                                         sa.map_tier_summary(sa.select_matches(out['matches'], tiers)))),
+        ("compositions tab",          n_form,   lambda: [sa.composition_win_rates(out['comps'].loc[[m]]) for m in out['comps'].index.unique()]),
+        ("round insights summary",    n_rounds, lambda: sa.round_insights_summary(sa.with_side_win_rates(sa.select_matches(out['matches'], tiers)))),
+        ("post-plant summary",        n_rounds, lambda: sa.post_plant_summary(out['matches'])),
+        ("site breakdown",            n_rounds, lambda: sa.site_post_plant_by_map(sa.select_rounds(out['rounds'], tiers))),
+        ("tempo summaries",           n_rounds, lambda: (lambda t: (sa.tempo_summary(t), sa.tempo_summary(t, by=('Map', 'Tempo'))))(
+                                                         sa.tempo_rounds(sa.select_rounds(out['rounds'], tiers)))),
+        ("build cubes",               n_rounds, keep('cubes', lambda: (sa.build_round_cube(out['rounds']), sa.build_match_cube(out['matches'])))),
+        ("cube: overview",            n_rounds, lambda: (sa.cube_map_outcome_summary(sa.select_matches(out['cubes'][1], tiers)),
+                                                         sa.cube_map_tier_summary(sa.select_matches(out['cubes'][1], tiers)))),
+        ("cube: site breakdown",      n_rounds, lambda: sa.cube_site_by_map(sa.select_rounds(out['cubes'][0], tiers))),
+        ("cube: tempo",               n_rounds, lambda: (sa.cube_tempo_summary(sa.select_rounds(out['cubes'][0], tiers)),
+                                                         sa.cube_tempo_summary(sa.select_rounds(out['cubes'][0], tiers), by=('Map', 'Tempo')))),
+        ("pistol summary",            n_rounds, lambda: (sa.pistol_summary(out['matches']), sa.second_round_conversions(out['matches']))),
+        ("player stats (all players)", n_form,  lambda: [sa.player_agent_stats(sa.select_player_rows(out['form'], p, pd.Timestamp.min.date(), pd.Timestamp.max.date()))
+                                                         for p in out['form']['Player'].dropna().unique()]),
+        ("compare (all players)",     n_form,   lambda: [sa.compare_agent_stats(sa.select_player_rows(out['form'], p, pd.Timestamp.min.date(), pd.Timestamp.max.date()))
+                                                         for p in out['form']['Player'].dropna().unique()]),
+    ]
+
+
+def run(scales, repeat, workdir):
+    results = []
+    for scale in scales:
+        folder = os.path.join(workdir, f"x{scale}")
+        paths = write_scrims(folder, REAL_MATCHES * scale)
+        print(f"\n── {scale}× ({REAL_MATCHES * scale} matches) " + "─" * 40)
+        print(f"{'stage':<28}{'ms':>10}{'rows/s':>14}{'peak MiB':>10}")
+        for name, rows, fn in stages(paths):
+            secs, peak, _ = measure(fn, repeat)
+            print(f"{name:<28}{secs * 1000:>10.1f}{rows / secs:>14,.0f}{peak / 2**20:>10.1f}")
+            results.append({"scale": scale, "stage": name, "rows": rows, "seconds": secs, "peak_bytes": peak})
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        base = {(r["scale"], r["stage"]): r for r in json.load(f)}
+    print(f"\n── vs {baseline_path} " + "─" * 40)
+    print(f"{'scale':>6}  {'stage':<28}{'time ×':>8}{'peak ×':>8}")
+    for r in results:
+        b = base.get((r["scale"], r["stage"]))
+        if b:
+            print(f"{r['scale']:>6}  {r['stage']:<28}{r['seconds'] / b['seconds']:>8.2f}{r['peak_bytes'] / max(b['peak_bytes'], 1):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                        help="multiples of the real sheet's match count")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--json", help="write the results here")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    parser.add_argument("--keep", help="generate data into this folder instead of a temp dir")
+    args = parser.parse_args()
+
+    workdir = args.keep or tempfile.mkdtemp(prefix="scrim_bench_")
+    try:
+        results = run(args.scale, args.repeat, workdir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
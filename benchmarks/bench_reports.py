@@ -0,0 +1,56 @@
+"""A batch report run (team + every player + every map) with 1, 2, 4 … worker processes.
+
+    python benchmarks/bench_reports.py                       # 10× the real sheet, HTML
+    python benchmarks/bench_reports.py --scale 100 --workers 1 2 4 8 --format pdf
+
+Times `python -m scrim_analytics.report --each player map` over the whole synthetic
+history: loading the tables once, then writing every report with each worker count.
+Most of a report's time goes into building its Plotly figures, then into rendering
+them. Without kaleido and a Chrome it can start, only the matplotlib charts are
+rendered (HTML embeds the Plotly ones as they are), and --format pdf is unavailable.
+Speed-ups are relative to one worker, which writes in this process.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrim_analytics import report  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10, help="multiple of the real sheet's match count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--format", choices=("html", "pdf"), default="html")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_reports_") as workdir:
+        paths = write_scrims(os.path.join(workdir, "data"), REAL_MATCHES * args.scale)
+        t = time.perf_counter()
+        tables = report.load_tables(paths['rounds'], paths['form'], paths['foracs'])
+        print(f"{REAL_MATCHES * args.scale:,} matches, loaded in {time.perf_counter() - t:.2f}s, "
+              f"image engine: {report.image_engine() or 'none (interactive HTML)'}")
+
+        dates = tables['matches']['Date'].dropna()
+        start, end = dates.min().date(), dates.max().date()
+        baseline = None
+        for workers in args.workers:
+            out = os.path.join(workdir, f"out{workers}")
+            t = time.perf_counter()
+            files = report.write_reports(tables, start, end, out, each=("player", "map"), fmt=args.format,
+                                         workers=workers)
+            secs = time.perf_counter() - t
+            baseline = baseline or secs
+            print(f"{workers:>2} workers: {len(files)} reports in {secs:6.2f}s "
+                  f"({len(files) / secs:4.1f}/s, ×{baseline / secs:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Tab summaries as SQL store queries vs pandas over the loaded tables, on a synthetic history.
+
+    python benchmarks/bench_sqlstore.py                  # 100× the real sheet over two seasons
+    python benchmarks/bench_sqlstore.py --scale 1000 --engine sqlite
+
+The pandas side starts from tables (and cubes) already in memory, as a warm
+dashboard does, and times only the filtering and summary; the store side times
+the query plus the roll-up that finishes it. The query is the sidebar's most
+common one: the last 30 days of Tier 1 and 2 scrims. Each pair is checked for equal
+output (means to float tolerance) and timed (best of --repeat).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics import sqlstore  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def same(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for k in a:
+            same(a[k], b[k])
+        return
+    pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_dtype=False,
+                                  check_categorical=False, check_exact=False, rtol=1e-6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="multiple of the real sheet's match count")
+    parser.add_argument("--days", type=int, default=730, help="calendar span of the history (two seasons by default)")
+    parser.add_argument("--engine", choices=("duckdb", "sqlite"), default=sqlstore.SQL_ENGINE)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_sql_") as workdir:
+        paths = write_scrims(os.path.join(workdir, "csv"), REAL_MATCHES * args.scale, days=args.days)
+        db = os.path.join(workdir, f"scrims.{args.engine}")
+        t = time.perf_counter()
+        sqlstore.build_store(db, paths['rounds'], paths['form'], args.engine)
+        print(f"built {args.engine} store for {REAL_MATCHES * args.scale:,} matches in {time.perf_counter() - t:.1f}s "
+              f"({os.path.getsize(db) / 2**20:.1f} MiB)")
+        store = sqlstore.SqlStore(db, args.engine)
+
+        rounds = sa.read_rounds(paths['rounds'])
+        matches = sa.read_matches(paths['rounds'], rounds=rounds)
+        form = sa.read_player_form(paths['form'])
+        round_cube, match_cube = sa.build_round_cube(rounds), sa.build_match_cube(matches)
+
+        tiers = (1, 2)
+        end = matches['Date'].max().date()
+        start = end - timedelta(days=30)
+        player = form['Player'].value_counts().index[0]
+
+        def rows():
+            return sa.select_matches(matches, tiers, start, end)
+
+        queries = [
+            ("map WR", lambda: sa.cube_map_outcome_summary(sa.select_matches(match_cube, tiers, start, end)),
+                       lambda: sa.cube_map_outcome_summary(store.match_cells(tiers, start, end))),
+            ("map × tier WR", lambda: sa.cube_map_tier_summary(sa.select_matches(match_cube, tiers, start, end)),
+                              lambda: sa.cube_map_tier_summary(store.match_cells(tiers, start, end))),
+            ("insights", lambda: sa.round_insights_summary(rows()),
+                         lambda: store.round_insights_summary(tiers, start, end)),
+            ("post-plant", lambda: sa.post_plant_summary(rows()),
+                           lambda: store.post_plant_summary(tiers, start, end)),
+            ("pistol", lambda: sa.pistol_summary(rows()),
+                       lambda: store.pistol_summary(tiers, start, end)),
+            ("sites", lambda: sa.cube_site_by_map(sa.select_rounds(round_cube, tiers, start, end)),
+                      lambda: sa.cube_site_by_map(store.round_cells(tiers, start, end))),
+            ("tempo", lambda: sa.cube_tempo_summary(sa.select_rounds(round_cube, tiers, start, end), by=('Map', 'Tempo')),
+                      lambda: sa.cube_tempo_summary(store.round_cells(tiers, start, end), by=('Map', 'Tempo'))),
+            ("agent stats", lambda: sa.player_agent_stats(sa.select_player_rows(form, player, start, end)),
+                            lambda: store.player_agent_stats(player, start, end)),
+        ]
+        print(f"\nquery: tiers {tiers}, {start} … {end}; agent stats for {player}")
+        print(f"{'summary':<15}{'pandas ms':>11}{'sql ms':>9}{'ratio':>8}")
+        for name, frames, sql in queries:
+            t_pandas, expected = best_of(frames, args.repeat)
+            t_sql, got = best_of(sql, args.repeat)
+            same(got, expected)
+            print(f"{name:<15}{t_pandas * 1000:>11.2f}{t_sql * 1000:>9.2f}{t_pandas / t_sql:>7.1f}×")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Peak memory of loading a big round sheet whole vs in chunks.
+
+    python benchmarks/bench_streaming.py                     # 100× the real sheet
+    python benchmarks/bench_streaming.py --scale 1000 --chunksize 10000 50000 200000
+
+Each load runs in a fresh process. Its cost is how far that process's peak
+resident size (VmHWM, reset just before the load) rises above its size before the
+load. tracemalloc can't be used because pandas keeps text in Arrow buffers, which
+tracemalloc doesn't see. Linux only. "whole" is pd.read_csv + normalize_rounds
+(+ aggregate_matches for the match table), as the loaders did before chunking.
+Every chunked result is checked against the whole-sheet one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics import streaming  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66
+
+
+def whole_rounds(path, _):
+    return sa.sort_by_date(sa.normalize_rounds(pd.read_csv(path)))
+
+
+def whole_matches(path, _):
+    return sa.sort_by_date(sa.aggregate_matches(whole_rounds(path, None)), ignore_index=True)
+
+
+LOADS = {
+    'rounds':  (whole_rounds,  streaming.stream_rounds),
+    'matches': (whole_matches, streaming.stream_matches),
+}
+
+
+def _status_kib(field):
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(f"{field}:"))
+
+
+def _measure(table, chunksize, path):
+    """(seconds, peak growth MiB, table MiB, result) of one load, in this (fresh) process."""
+    whole, chunked = LOADS[table]
+    load = whole if chunksize is None else chunked
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")  # reset VmHWM to the current resident size
+    before = _status_kib("VmRSS")
+    t = time.perf_counter()
+    result = load(path, chunksize)
+    secs = time.perf_counter() - t
+    size = result.memory_usage(deep=True).sum() / 2**20
+    return secs, (_status_kib("VmHWM") - before) / 1024, size, result
+
+
+def in_fresh_process(*args):
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_measure, *args).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="multiple of the real sheet's match count")
+    parser.add_argument("--chunksize", type=int, nargs="+", default=[10_000, streaming.CHUNK_ROWS])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_stream_") as workdir:
+        path = write_scrims(workdir, REAL_MATCHES * args.scale)['rounds']
+        print(f"{REAL_MATCHES * args.scale:,} matches, {os.path.getsize(path) / 2**20:.1f} MiB of CSV")
+        print(f"\n{'table':<9}{'read':<14}{'s':>7}{'peak MiB':>10}{'table MiB':>11}")
+        for table in LOADS:
+            expected = None
+            for chunksize in [None, *args.chunksize]:
+                secs, peak, size, result = in_fresh_process(table, chunksize, path)
+                if expected is None:
+                    expected = result
+                else:
+                    pd.testing.assert_frame_equal(result, expected)
+                label = "whole" if chunksize is None else f"{chunksize:,}-row"
+                print(f"{table:<9}{label:<14}{secs:>7.2f}{peak:>10.1f}{size:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
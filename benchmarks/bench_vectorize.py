@@ -0,0 +1,178 @@
+"""Row-wise `apply` / lambda-aggregation versions vs the vectorized ones now in scrim_analytics.
+
+    python benchmarks/bench_vectorize.py               # 100× the real sheet
+    python benchmarks/bench_vectorize.py --scale 1000
+
+The legacy_* functions are the implementations the dashboard used before. Each pair
+is run on the same synthetic data, checked for equal output, and timed (best of
+--repeat).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrim_analytics as sa  # noqa: E402
+from scrim_analytics.synthetic import write_scrims  # noqa: E402
+
+REAL_MATCHES = 66
+
+
+# ── Legacy implementations ─────────────────────────────────────────────────────
+def legacy_extract_wr(row, side):
+    if pd.isna(row['Start']) or pd.isna(row['First Half WR']) or pd.isna(row['Second Half WR']):
+        return None
+    if side == 'Attack':
+        return row['First Half WR'] if row['Start'] == 'Attack' else row['Second Half WR']
+    elif side == 'Defence':
+        return row['First Half WR'] if row['Start'] == 'Defence' else row['Second Half WR']
+    return None
+
+
+def legacy_side_win_rates(matches):
+    out = matches.copy()
+    out['Atk WR Derived'] = out.apply(lambda row: legacy_extract_wr(row, 'Attack'),  axis=1)
+    out['Def WR Derived'] = out.apply(lambda row: legacy_extract_wr(row, 'Defence'), axis=1)
+    return out
+
+
+def legacy_map_outcome_summary(matches):
+    summary = matches.groupby('Map').agg(
+        Games=('Outcome', 'count'),
+        Wins=('Outcome', lambda x: (x.str.lower() == 'win').sum()),
+        Draws=('Outcome', lambda x: (x.str.lower() == 'draw').sum()),
+        Losses=('Outcome', lambda x: (x.str.lower() == 'loss').sum())
+    ).reset_index()
+    summary['Win Rate'] = summary['Wins'] / summary['Games']
+    return summary
+
+
+def legacy_map_tier_summary(matches):
+    summary = matches.groupby(['Map', 'Tier']).agg(
+        Games=('Outcome', 'count'),
+        Wins=('Outcome', lambda x: (x.str.lower() == 'win').sum())
+    ).reset_index()
+    summary['Win Rate %'] = summary['Wins'] / summary['Games'] * 100
+    summary['Tier Label'] = summary['Tier'].map(lambda t: f"Tier {t}")
+    return summary
+
+
+def legacy_tempo_summary(tempo_rd, by=('Tempo',)):
+    summary = tempo_rd.groupby(list(by), observed=True).agg(
+        Rounds=('Result', 'count'),
+        Wins=('Result', lambda x: (x.str.lower() == 'win').sum())
+    ).reset_index()
+    summary['Win Rate %'] = (summary['Wins'] / summary['Rounds'] * 100).round(1)
+    return summary
+
+
+def legacy_site_summary(rounds):
+    planted = rounds[rounds['Planted'] == True]
+    rows = []
+    for site in ['A', 'B', 'C']:
+        atk_rounds = planted[(planted['Site'] == site) & (planted['Side'] == 'Attack')]
+        def_rounds = planted[(planted['Site'] == site) & (planted['Side'] == 'Defence')]
+        atk_n = len(atk_rounds)
+        def_n = len(def_rounds)
+        atk_wr = round((atk_rounds['Result'].str.lower() == 'win').sum() / atk_n * 100, 1) if atk_n > 0 else None
+        def_wr = round((def_rounds['Result'].str.lower() == 'win').sum() / def_n * 100, 1) if def_n > 0 else None
+        if atk_n > 0 or def_n > 0:
+            rows.append({'Site': f'Site {site}', 'Post Plant (Atk)': atk_wr, 'Retake (Def)': def_wr,
+                         'Atk Plants': atk_n, 'Def Plants': def_n})
+    return pd.DataFrame(rows)
+
+
+def legacy_site_by_map(rounds):
+    return {m: legacy_site_summary(rounds[rounds['Map'] == m]) for m in sorted(rounds['Map'].dropna().unique())}
+
+
+def legacy_site_labels(site_long):
+    def make_label(row):
+        n = row['Atk Plants'] if row['Type'] == 'Post Plant (Atk)' else row['Def Plants']
+        return f"{row['Win Rate (%)']:.0f}% (n={n})"
+    return site_long.apply(make_label, axis=1)
+
+
+def site_labels(site_long):
+    n = site_long['Atk Plants'].where(site_long['Type'] == 'Post Plant (Atk)', site_long['Def Plants'])
+    return site_long['Win Rate (%)'].map('{:.0f}%'.format) + ' (n=' + n.astype(str) + ')'
+
+
+def legacy_agent_player_wins(acs):
+    return acs.groupby(['Player', 'Agent']).agg(
+        games=('Result', 'count'),
+        wins=('Result', lambda x: (x.str.strip().str.lower() == 'win').sum())
+    ).reset_index()
+
+
+def agent_player_wins(acs):
+    return acs.assign(_win=acs['Result'].str.strip().str.lower() == 'win').groupby(['Player', 'Agent']).agg(
+        games=('Result', 'count'), wins=('_win', 'sum')
+    ).reset_index()
+
+
+# ── Harness ────────────────────────────────────────────────────────────────────
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def assert_same(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for k in a:
+            assert_same(a[k], b[k])
+    elif isinstance(a, pd.Series):
+        pd.testing.assert_series_equal(a, b, check_names=False)
+    else:
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="multiple of the real sheet's match count")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scrim_vec_") as folder:
+        paths = write_scrims(folder, REAL_MATCHES * args.scale)
+        rounds  = sa.normalize_rounds(pd.read_csv(paths['rounds']))
+        matches = sa.read_matches(paths['rounds'], rounds=rounds)
+        acs     = sa.normalize_acs(pd.read_csv(paths['foracs']))
+    tempo_rd  = sa.tempo_rounds(rounds)
+    site_long = pd.concat(sa.site_post_plant_by_map(rounds).values()).melt(
+        id_vars=['Site', 'Atk Plants', 'Def Plants'], value_vars=['Post Plant (Atk)', 'Retake (Def)'],
+        var_name='Type', value_name='Win Rate (%)'
+    ).dropna(subset=['Win Rate (%)'])
+
+    pairs = [
+        ("Atk/Def WR (extract_wr)", lambda: legacy_side_win_rates(matches),
+                                    lambda: matches.assign(**dict(zip(['Atk WR Derived', 'Def WR Derived'], sa.side_win_rates(matches))))),
+        ("map outcome summary",     lambda: legacy_map_outcome_summary(matches), lambda: sa.map_outcome_summary(matches)),
+        ("map × tier summary",      lambda: legacy_map_tier_summary(matches), lambda: sa.map_tier_summary(matches)),
+        ("tempo summary by map",    lambda: legacy_tempo_summary(tempo_rd, ('Map', 'Tempo')),
+                                    lambda: sa.tempo_summary(tempo_rd, ('Map', 'Tempo'))),
+        ("site breakdown (all maps)", lambda: legacy_site_by_map(rounds), lambda: sa.site_post_plant_by_map(rounds)),
+        ("site bar labels",         lambda: legacy_site_labels(site_long), lambda: site_labels(site_long)),
+        ("player × agent wins",     lambda: legacy_agent_player_wins(acs), lambda: agent_player_wins(acs)),
+    ]
+    print(f"{len(rounds):,} rounds, {len(matches):,} matches, {len(acs):,} player rows\n")
+    print(f"{'':<28}{'legacy ms':>11}{'vector ms':>11}{'speed-up':>10}  output")
+    for name, legacy, vectorized in pairs:
+        t_old, old = best_of(legacy, args.repeat)
+        t_new, new = best_of(vectorized, args.repeat)
+        assert_same(old, new)
+        print(f"{name:<28}{t_old * 1000:>11.1f}{t_new * 1000:>11.1f}{t_old / t_new:>9.1f}×  equal")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Scrim analytics: the dashboard's data loading and metric logic, without Streamlit.
+
+Every function takes and returns plain DataFrames, so the same numbers the
+dashboard shows can be profiled, benchmarked or batch-run from a script:
+
+    from scrim_analytics import read_matches, select_matches, map_outcome_summary
+    matches = read_matches("Advanced_Data-_Sheet1.csv")
+    print(map_outcome_summary(select_matches(matches, tiers=(1, 2))))
+"""
+import importlib
+
+from .cache import CACHE_DIR, CACHE_EXT, CACHE_SCHEMA_VERSION, disk_cached, source_version
+from .cube import (
+    MATCH_CUBE_DIMS, ROUND_CUBE_DIMS, build_match_cube, build_round_cube, cube_map_outcome_summary,
+    cube_map_tier_summary, cube_site_by_map, cube_tempo_summary, rollup,
+)
+from .compositions import build_composition_index, composition_win_rates
+from .dates import SORTED_FLAG, date_options, date_slice, sort_by_date
+from .loaders import read_acs, read_compositions, read_matches, read_player_form, read_rounds
+from .matches import (
+    MATCH_COLUMNS, MATCH_KEY, aggregate_matches, map_outcome_summary, map_tier_summary, merge_matches,
+    outcome_flags, pistol_summary, post_plant_summary, round_insights_summary, second_round_conversions,
+    select_matches, side_win_rates, tier_games, with_side_win_rates,
+)
+from .players import (
+    ACS_LABEL_COLUMNS, AGENT_ROLES, COMPARE_STAT_AGGREGATES, FORM_LABEL_COLUMNS, FORM_TEXT_COLUMNS,
+    RADAR_NORM_BASE, VCT_BENCHMARKS, agent_player_win_rates, agent_stat_aggregates, compare_agent_stats,
+    normalize_acs, normalize_player_form, player_agent_stats, radar_values, role_averages, select_acs_rows,
+    select_player_rows,
+)
+from .rounds import (
+    ROUND_FLOAT_COLUMNS, ROUND_LABEL_COLUMNS, ROUND_NUMBER_COLUMNS, ROUND_TEXT_COLUMNS, TEMPO_BINS,
+    TEMPO_LABELS, append_rounds, clock_to_seconds, normalize_rounds, select_rounds, site_post_plant_by_map,
+    site_post_plant_summary, tempo_buckets, tempo_rounds, tempo_summary,
+)
+from .schema import blank_to_na, compact, compact_number, concat_compact, memory_report, widen
+from .streaming import CHUNK_ROWS, read_round_chunks, stream_matches, stream_rounds
+
+# Modules that also run as `python -m scrim_analytics.<module>` are imported on first
+# use of one of their names, so running them doesn't find them already imported.
+_LAZY_MODULES = {
+    'folders':    ('EXPORT_KINDS', 'export_files', 'export_kind', 'read_folder', 'stack_matches', 'stack_tables'),
+    'partitions': ('STORE_VERSION', 'ingest', 'manifest_path', 'partition_keys', 'prune_partitions',
+                   'read_manifest', 'rosters', 'scan_partitions', 'store_tier_games', 'write_partitions'),
+    'sqlstore':   ('SQL_ENGINE', 'SQL_STORE_VERSION', 'SqlStore', 'build_store', 'open_store'),
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_NAMES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_NAMES])
@@ -0,0 +1,130 @@
+"""On-disk cache of parsed/aggregated tables.
+
+Parsed tables are persisted next to the CSVs so a restart doesn't re-parse text.
+Entries are keyed on the source's path, size and mtime (plus CACHE_SCHEMA_VERSION
+— bump it whenever a table's shape changes).
+
+Each entry also records the source's size and a hash of its bytes. When the source
+has only grown since (the old bytes are unchanged, so rows were appended), a table
+with an `extend` function is updated from the appended rows instead of rebuilt.
+"""
+import glob
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+CACHE_DIR = ".scrim_cache"
+CACHE_SCHEMA_VERSION = 8
+
+try:
+    import pyarrow  # noqa: F401  (parquet engine)
+    CACHE_EXT = "parquet"
+except ImportError:
+    CACHE_EXT = "pkl"
+
+
+def _read_table(path):
+    return pd.read_parquet(path) if CACHE_EXT == "parquet" else pd.read_pickle(path)
+
+
+def _write_table(df, path):
+    tmp = f"{path}.tmp"
+    if CACHE_EXT == "parquet":
+        df.to_parquet(tmp)  # keep the index: loaded tables carry source row numbers
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def _digest(path, size):
+    """sha1 object over the first `size` bytes of `path`."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while size > 0:
+            chunk = f.read(min(size, 1 << 20))
+            if not chunk:
+                break
+            h.update(chunk)
+            size -= len(chunk)
+    return h
+
+
+def _csv_rows(source, data):
+    """Headerless CSV bytes from `source` parsed under its header row."""
+    header = pd.read_csv(source, nrows=0).columns
+    if not data.strip():
+        return pd.DataFrame(columns=header)
+    return pd.read_csv(io.BytesIO(data), header=None, names=header)
+
+
+def _extend_previous(source, size, cache_dir, prefix, extend):
+    """(table, (size, sha1)) from `extend`ing the last entry with the rows appended since; (None, None) if it can't."""
+    for meta_path in glob.glob(os.path.join(cache_dir, f"{glob.escape(prefix)}.*.json")):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            old = meta["size"]
+            if meta["schema"] != CACHE_SCHEMA_VERSION or not 0 < old < size:
+                continue
+            h = _digest(source, old)
+            if h.hexdigest() != meta["sha1"]:
+                continue  # existing rows were edited
+            with open(source, "rb") as f:
+                f.seek(old - 1)
+                data = f.read(size - old + 1)
+            if not data.startswith(b"\n"):
+                continue  # the old last row was cut mid-line, so it changed too
+            table = extend(_read_table(os.path.join(cache_dir, meta["table"])), _csv_rows(source, data[1:]))
+            h.update(data[1:])
+            return table, (size, h.hexdigest())
+        except Exception:
+            continue  # anything unexpected: full rebuild
+    return None, None
+
+
+def source_version(path: str) -> tuple[int, int]:
+    """Cheap fingerprint of a source file: (size, mtime_ns)."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def disk_cached(table: str, source: str, build, extend=None) -> pd.DataFrame:
+    """Return `build()` for `source`, persisted on disk until the source file changes.
+
+    `extend(previous_table, appended_rows)`, when given, is used instead of `build`
+    if rows were only appended to the source since the last entry was written.
+    """
+    size, mtime_ns = source_version(source)
+    key = f"{os.path.abspath(source)}|{size}|{mtime_ns}|v{CACHE_SCHEMA_VERSION}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIR)
+    prefix = f"{os.path.splitext(os.path.basename(source))[0]}.{table}"
+    target = os.path.join(cache_dir, f"{prefix}.{digest}.{CACHE_EXT}")
+
+    if os.path.exists(target):
+        try:
+            return _read_table(target)
+        except Exception:
+            pass  # corrupt or from an incompatible engine — rebuild below
+
+    df, state = _extend_previous(source, size, cache_dir, prefix, extend) if extend else (None, None)
+    if df is None:
+        state = (size, _digest(source, size).hexdigest()) if extend else None
+        df = build()
+        if state and source_version(source) != (size, mtime_ns):
+            state = None  # changed while building; don't vouch for its bytes
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(prefix)}.*")):
+            os.remove(stale)
+        _write_table(df, target)
+        if state:
+            with open(f"{target}.json", "w") as f:
+                json.dump({"schema": CACHE_SCHEMA_VERSION, "size": state[0], "sha1": state[1],
+                           "table": os.path.basename(target)}, f)
+    except OSError:
+        pass  # read-only deploy: still serve the freshly built table
+    return df
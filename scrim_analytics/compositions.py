@@ -0,0 +1,52 @@
+"""5-agent composition index (form.csv blocks linked to the match table)."""
+import numpy as np
+import pandas as pd
+
+
+def build_composition_index(form: pd.DataFrame, matches: pd.DataFrame) -> pd.DataFrame:
+    """One row per team-match in form.csv with its canonical 5-agent composition.
+
+    form.csv lists each match as five consecutive player rows (file order, which the
+    form table's index keeps through its date sort); a block counts when
+    all five share the map and result. Blocks are joined to the match table on
+    (Map, Date) — preferring the match with the same outcome when a map was played
+    twice that day — to pick up the opponent tier. Blocks with no match in the round
+    sheet count as Tier 1, like untiered matches, so tier filters keep them.
+    Indexed by Map so a map's compositions are a single `.loc` lookup.
+    """
+    rows = form[['Column 1', 'Agent', 'Result', 'Date']].sort_index().dropna(subset=['Column 1', 'Agent', 'Result'])
+    rows = rows.iloc[:len(rows) // 5 * 5].reset_index(drop=True)
+    g = rows.groupby(np.arange(len(rows)) // 5)
+    agents = np.sort(rows['Agent'].to_numpy(dtype=str).reshape(-1, 5), axis=1)
+    comps = pd.DataFrame({
+        'Map':         g['Column 1'].first().astype(str),
+        'Date':        g['Date'].first(),
+        'Result':      g['Result'].first(),
+        'Composition': ['-'.join(a) for a in agents],
+    })
+    comps = comps[(g['Column 1'].nunique() == 1) & (g['Result'].nunique() == 1)].rename_axis('Block').reset_index()
+
+    linked = comps.merge(matches[['Map', 'Date', 'Tier', 'Outcome']], on=['Map', 'Date'], how='left')
+    linked['_same_outcome'] = linked['Outcome'].str.lower() == linked['Result'].str.lower()
+    linked = linked.sort_values(['Block', '_same_outcome'], ascending=[True, False], kind='stable')
+    comps = linked.drop_duplicates('Block').drop(columns=['Outcome', '_same_outcome'])
+    comps['Tier'] = comps['Tier'].fillna(1).astype(matches['Tier'].dtype)
+
+    result = comps['Result'].str.lower()
+    comps['Win']  = (result == 'win').astype(int)
+    comps['Draw'] = (result == 'draw').astype(int)
+    comps['Loss'] = (result == 'loss').astype(int)
+    return comps.set_index('Map').sort_index(kind='stable')
+
+
+def composition_win_rates(comps: pd.DataFrame, top: int = 15) -> pd.DataFrame:
+    """Games / results / win rate per composition, best `top` first."""
+    grouped = comps.groupby('Composition').agg(
+        games=('Result', 'size'), wins=('Win', 'sum'), draws=('Draw', 'sum'), losses=('Loss', 'sum')
+    ).reset_index()
+    return _composition_rates(grouped, top)
+
+
+def _composition_rates(grouped, top):
+    grouped['Win Rate %'] = grouped['wins'] / grouped['games'] * 100
+    return grouped.sort_values(by='Win Rate %', ascending=False).head(top)
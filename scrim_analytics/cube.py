@@ -0,0 +1,86 @@
+"""Pre-aggregated count cubes, so tab summaries roll up small tables instead of scanning rows.
+
+The round cube holds rounds / wins per (Map, Tier, Date, Side, Site, Planted, Tempo)
+cell; the match cube holds games and results per (Map, Tier, Date). Cells keep the
+source columns' values and dtypes, so select_rounds / select_matches slice them
+exactly as they slice the full tables, and every roll-up here returns the same
+frame as its row-level counterpart.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from .dates import sort_by_date
+from .matches import outcome_flags
+from .rounds import _sites_by_map, tempo_buckets
+
+ROUND_CUBE_DIMS = ['Map', 'Tier', 'Date', 'Side', 'Site', 'Planted', 'Tempo']
+MATCH_CUBE_DIMS = ['Map', 'Tier', 'Date']
+
+
+def build_round_cube(rounds: pd.DataFrame) -> pd.DataFrame:
+    """Rows, rounds with a result and wins per ROUND_CUBE_DIMS cell (missing values kept as cells).
+
+    Tier is stored with the untiered → Tier 1 default applied; Tempo buckets every
+    round's engagement time (roll-ups restrict it to attack rounds).
+    """
+    result = rounds['Result']
+    cells = pd.DataFrame({
+        'Map':     rounds['Map'],
+        'Tier':    rounds['Tier'].fillna(1).astype(int) if 'Tier' in rounds.columns else 1,
+        'Date':    rounds['Date'],
+        'Side':    rounds['Side'],
+        'Site':    rounds['Site'],
+        'Planted': rounds['Planted'],
+        'Tempo':   rounds['Tempo'] if 'Tempo' in rounds.columns else tempo_buckets(rounds['Engage Secs']),
+        'Rows':    1,
+        'Rounds':  result.notna().astype(int),
+        'Wins':    (result.str.lower() == 'win').astype(int),
+    })
+    return sort_by_date(cells.groupby(ROUND_CUBE_DIMS, observed=True, dropna=False, sort=False).sum().reset_index())
+
+
+def build_match_cube(matches: pd.DataFrame) -> pd.DataFrame:
+    """Games / wins / draws / losses per MATCH_CUBE_DIMS cell."""
+    flags = outcome_flags(matches['Outcome']).astype(int)
+    cells = matches[MATCH_CUBE_DIMS].assign(
+        Games=matches['Outcome'].notna().astype(int),
+        Wins=flags['_win'], Draws=flags['_draw'], Losses=flags['_loss'],
+    )
+    return sort_by_date(cells.groupby(MATCH_CUBE_DIMS, dropna=False, sort=False).sum().reset_index())
+
+
+def rollup(cells: pd.DataFrame, by, measures=('Rounds', 'Wins')) -> pd.DataFrame:
+    """Sum `measures` over every dimension not in `by`."""
+    return cells.groupby(list(by), observed=True)[list(measures)].sum().reset_index()
+
+
+# ── Roll-ups matching the row-level summaries ──────────────────────────────────
+def cube_tempo_summary(cells: pd.DataFrame, by=('Tempo',)) -> pd.DataFrame:
+    """Same frame as tempo_summary(tempo_rounds(rounds), by)."""
+    attack = cells[(cells['Side'] == 'Attack') & cells['Tempo'].notna()]
+    summary = rollup(attack, by)
+    summary['Win Rate %'] = (summary['Wins'] / summary['Rounds'] * 100).round(1)
+    return summary
+
+
+def cube_site_by_map(cells: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Same dict as site_post_plant_by_map(rounds)."""
+    planted = cells[cells['Planted'] == True]
+    counts = planted.groupby(['Map', 'Site', 'Side'], observed=True)[['Rows', 'Wins']].sum()
+    return _sites_by_map(counts.rename(columns={'Rows': 'size', 'Wins': 'sum'}), cells['Map'])
+
+
+def cube_map_outcome_summary(cells: pd.DataFrame) -> pd.DataFrame:
+    """Same frame as map_outcome_summary(matches)."""
+    summary = rollup(cells, ['Map'], ['Games', 'Wins', 'Draws', 'Losses'])
+    summary['Win Rate'] = summary['Wins'] / summary['Games']
+    return summary
+
+
+def cube_map_tier_summary(cells: pd.DataFrame) -> pd.DataFrame:
+    """Same frame as map_tier_summary(matches)."""
+    summary = rollup(cells, ['Map', 'Tier'], ['Games', 'Wins'])
+    summary['Win Rate %'] = summary['Wins'] / summary['Games'] * 100
+    summary['Tier Label'] = 'Tier ' + summary['Tier'].astype(str)
+    return summary
@@ -0,0 +1,46 @@
+"""Date-sorted tables and binary-search date-range slicing.
+
+Every loaded table is kept sorted by Date with undated (NaT) rows at the end, so a
+date range is two searchsorted calls and a positional slice instead of a per-row
+comparison. The index keeps each row's position in the source file, for anything
+that depends on file order (form.csv's five-row composition blocks).
+sort_by_date marks the frame it returns (via ``attrs``, which pandas
+carries through filtering, copies and pickling); an unmarked frame is filtered
+with a plain vectorised comparison instead, so unsorted input still gives the
+right rows.
+"""
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+
+SORTED_FLAG = 'date_sorted'
+
+
+def sort_by_date(df: pd.DataFrame, col: str = 'Date', ignore_index: bool = False) -> pd.DataFrame:
+    """`df` stably sorted by `col` with NaT last (index kept unless `ignore_index`), marked for date_slice."""
+    out = df.sort_values(col, kind='stable', na_position='last', ignore_index=ignore_index)
+    out.attrs[SORTED_FLAG] = col
+    return out
+
+
+def date_options(df: pd.DataFrame, col: str = 'Date') -> list[date]:
+    """Distinct calendar dates in `col`, ascending (a Python date per distinct day, not per row)."""
+    days = pd.DatetimeIndex(df[col].dropna().dt.normalize().unique()).sort_values()
+    return list(days.date)
+
+
+def date_slice(df: pd.DataFrame, start_date: date, end_date: date, keep_undated: bool = False,
+               col: str = 'Date') -> pd.DataFrame:
+    """Rows dated within [start_date, end_date] (whole days), plus undated rows if `keep_undated`."""
+    dates = df[col]
+    lo, hi = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    if df.attrs.get(SORTED_FLAG) != col:
+        return df[((dates >= lo) & (dates < hi)) | (keep_undated & dates.isna())]
+    rows = df.iloc[dates.searchsorted(lo):dates.searchsorted(hi)]
+    if keep_undated:
+        undated = df.iloc[dates.searchsorted(pd.NaT):]
+        if len(undated):
+            rows = pd.concat([rows, undated])
+    return rows
@@ -0,0 +1,395 @@
+"""The dashboard's charts, built from summary tables without Streamlit.
+
+Each function takes what a summary function returns and gives back a styled
+Plotly figure (the ACS beeswarm is matplotlib), so the dashboard and the batch
+report (see report) draw the same charts.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .players import VCT_BENCHMARKS, radar_values, role_averages
+from .rounds import TEMPO_LABELS
+
+POST_PLANT_LABELS = {"Atk_PP_Success": "Post Plant", "Def_PP_Success": "Retakes"}
+TEMPO_COLORS = {
+    'Very Early (≤0:40)':   '#60a5fa',
+    'Early (0:41–1:00)':    '#34d399',
+    'Mid (1:01–1:15)':      '#E63946',
+    'Late (1:16–1:40)':     '#f97316',
+}
+
+
+# ── Overview ───────────────────────────────────────────────────────────────────
+def map_win_rate_figure(summary: pd.DataFrame) -> go.Figure:
+    """Horizontal win-rate bars from map_outcome_summary."""
+    winrate_df = summary[['Map', 'Win Rate']].dropna().copy()
+    winrate_df['Win Rate %'] = winrate_df['Win Rate'] * 100
+    winrate_df = winrate_df.sort_values(by='Win Rate %', ascending=False)
+    fig_map_wr = px.bar(
+        winrate_df, x='Win Rate %', y='Map', orientation='h',
+        text=winrate_df['Win Rate %'].apply(lambda x: f"{x:.1f}%"),
+        title="Map Win Rates",
+        color='Win Rate %', color_continuous_scale=['#450a0a', '#E63946']
+    )
+    fig_map_wr.update_traces(textposition='outside', marker_line_color='#000000', marker_line_width=1.2)
+    fig_map_wr.update_layout(
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', size=14, color='#E63946'),
+        title_font=dict(size=20, color='#E63946'),
+        yaxis=dict(tickfont=dict(color='#ffffff'), categoryorder='total ascending', gridcolor='#333333'),
+        xaxis=dict(title='Win Rate (%)', title_font=dict(color='#E63946'), tickfont=dict(color='#ffffff'), gridcolor='#333333', range=[0, 100])
+    )
+    return fig_map_wr
+
+
+def map_tier_figure(tier_map_summary: pd.DataFrame) -> go.Figure:
+    """Grouped Map × Tier win-rate bars from map_tier_summary."""
+    fig_tier = px.bar(
+        tier_map_summary, x='Map', y='Win Rate %', color='Tier Label',
+        color_discrete_map={'Tier 1': '#E63946', 'Tier 2': '#9ca3af', 'Tier 3': '#9a3412'},
+        barmode='group',
+        text=tier_map_summary['Win Rate %'].apply(lambda x: f"{x:.0f}%"),
+        title="Win Rate by Map & Tier"
+    )
+    fig_tier.update_traces(textposition='outside', marker_line_color='#333', marker_line_width=1)
+    fig_tier.update_layout(
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#E63946'),
+        title_font=dict(size=18, color='#E63946'),
+        xaxis=dict(tickfont=dict(color='#fff'), gridcolor='#333'),
+        yaxis=dict(range=[0, 110], tickfont=dict(color='#fff'), gridcolor='#333'),
+        legend=dict(font=dict(color='#fff'))
+    )
+    return fig_tier
+
+
+# ── Compositions ───────────────────────────────────────────────────────────────
+def agent_win_rate_heatmap(pivot: pd.DataFrame, pivot_wins: pd.DataFrame, pivot_games: pd.DataFrame) -> go.Figure:
+    """Player × agent win-rate heatmap from agent_player_win_rates (grey where not played)."""
+    all_players = pivot.index.tolist()
+    all_agents  = pivot.columns.tolist()
+    NOT_PLAYED = -1
+    z = pivot.values.copy().astype(float)
+    z[pd.isna(z)] = NOT_PLAYED
+    customdata = []
+    for player in all_players:
+        row = []
+        for agent in all_agents:
+            g = pivot_games.loc[player, agent] if pd.notna(pivot_games.loc[player, agent]) else 0
+            g = int(g)
+            if g == 0:
+                row.append("Not played")
+            else:
+                w  = int(pivot_wins.loc[player, agent]) if pd.notna(pivot_wins.loc[player, agent]) else 0
+                wr = float(pivot.loc[player, agent]) if pd.notna(pivot.loc[player, agent]) else 0
+                row.append(f"Win Rate: {wr:.0f}% ({w}/{g})")
+        customdata.append(row)
+    text = [[f"{v:.0f}%" if v >= 0 else "" for v in row] for row in z]
+    fig_heat = go.Figure(data=go.Heatmap(
+        z=z, x=all_agents, y=all_players, customdata=customdata,
+        zmin=NOT_PLAYED, zmax=100,
+        colorscale=[[0,'#9ca3af'],[0.01,'#7f1d1d'],[0.06,'#fecaca'],[0.36,'#fca5a5'],[0.66,'#ef4444'],[1,'#7f1d1d']],
+        text=text, texttemplate="%{text}",
+        textfont=dict(family='Rajdhani', size=12, color='white'),
+        hoverongaps=False,
+        hovertemplate="Player: %{y}<br>Agent: %{x}<br>%{customdata}<extra></extra>"
+    ))
+    fig_heat.update_layout(
+        title="Win Rate % by Player and Agent",
+        xaxis=dict(title='Agent', side='bottom', tickangle=-45, tickfont=dict(family='Rajdhani', color='#E63946')),
+        yaxis=dict(title='Player', tickfont=dict(family='Rajdhani', color='#E63946'), autorange='reversed'),
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#E63946'),
+        title_font=dict(size=18, color='#E63946'),
+        margin=dict(l=80, r=40, t=60, b=120),
+        height=max(400, 48*len(pivot.index)+120),
+        width=max(400, 48*len(pivot.columns)+100)
+    )
+    return fig_heat
+
+
+# ── Round insights ─────────────────────────────────────────────────────────────
+def side_win_rate_figure(summary: pd.DataFrame) -> go.Figure:
+    """Attack vs defence round win rate per map from round_insights_summary."""
+    plot_df = summary[['Map', 'Raw_Atk_WR', 'Raw_Def_WR']].copy()
+    plot_df.rename(columns={'Raw_Atk_WR': 'Attack', 'Raw_Def_WR': 'Defense'}, inplace=True)
+    plot_df['Attack']   *= 100
+    plot_df['Defense']  *= 100
+    plot_df = plot_df.melt(id_vars='Map', var_name='Side', value_name='Win Rate (%)')
+    fig = px.bar(
+        plot_df, x='Map', y='Win Rate (%)', color='Side',
+        color_discrete_map={'Attack': '#E63946', 'Defense': '#ffffff'},
+        barmode='group',
+        text=plot_df['Win Rate (%)'].apply(lambda x: f"{x:.1f}%"),
+        title="Attack vs Defense Win Rates by Map"
+    )
+    fig.update_traces(textposition='outside', marker_line_color='#333333', marker_line_width=1.2, width=0.4)
+    fig.update_layout(
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(color='#E63946', family='Rajdhani'),
+        title_font=dict(color='#E63946', size=20),
+        xaxis=dict(tickangle=-25, gridcolor='#333333'),
+        yaxis=dict(range=[0, 100], gridcolor='#333333')
+    )
+    return fig
+
+
+def post_plant_figure(pp_summary: pd.DataFrame, sort_col: str = 'Atk_PP_Success', ascending: bool = False) -> go.Figure:
+    """Stacked post-plant / retake bars from post_plant_summary, maps sorted by `sort_col`."""
+    pp_df = pp_summary.copy()  # callers may reuse the summary; don't scale it in place
+    if pp_df['Atk_PP_Success'].max() <= 1.0:
+        pp_df['Atk_PP_Success'] *= 100
+        pp_df['Def_PP_Success'] *= 100
+    pp_df = pp_df.sort_values(by=sort_col, ascending=ascending)
+    pp_df['Map'] = pd.Categorical(pp_df['Map'], categories=pp_df['Map'], ordered=True)
+    pp_df.rename(columns=POST_PLANT_LABELS, inplace=True)
+    pp_df_long = pp_df.melt(id_vars='Map', var_name='Side', value_name='Post-Plant Success (%)')
+    fig_pp = px.bar(
+        pp_df_long, x='Map', y='Post-Plant Success (%)', color='Side', barmode='stack',
+        text=pp_df_long['Post-Plant Success (%)'].apply(lambda x: f"{x:.1f}%"),
+        title="Post-Plant Success Rate (Stacked Atk + Def)",
+        color_discrete_map={'Post Plant': '#E63946', 'Retakes': '#ffffff'}
+    )
+    fig_pp.update_traces(textposition='inside', marker_line_color='#333333', marker_line_width=1.2)
+    fig_pp.update_layout(
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', size=14, color='#E63946'),
+        title_font=dict(size=20, color='#E63946'),
+        xaxis=dict(tickangle=-25, gridcolor='#333333', tickfont=dict(color='#fff')),
+        yaxis=dict(range=[0, 100], gridcolor='#333333', tickfont=dict(color='#fff')),
+        legend=dict(font=dict(color='#fff'))
+    )
+    return fig_pp
+
+
+def site_figure(site_summary: pd.DataFrame, map_name: str) -> go.Figure:
+    """Post-plant vs retake win rate per site (labelled with plant counts) for one map."""
+    site_long = site_summary.melt(
+        id_vars=['Site', 'Atk Plants', 'Def Plants'],
+        value_vars=['Post Plant (Atk)', 'Retake (Def)'],
+        var_name='Type', value_name='Win Rate (%)'
+    ).dropna(subset=['Win Rate (%)'])
+
+    n = site_long['Atk Plants'].where(site_long['Type'] == 'Post Plant (Atk)', site_long['Def Plants'])
+    site_long['Label'] = site_long['Win Rate (%)'].map('{:.0f}%'.format) + ' (n=' + n.astype(str) + ')'
+    fig_site = px.bar(
+        site_long, x='Site', y='Win Rate (%)', color='Type', barmode='group',
+        text='Label',
+        color_discrete_map={'Post Plant (Atk)': '#E63946', 'Retake (Def)': '#60a5fa'},
+        title=f"Post-Plant Win Rate by Site — {map_name}",
+        category_orders={'Site': ['Site A', 'Site B', 'Site C']}
+    )
+    fig_site.update_traces(textposition='outside', marker_line_color='#333', marker_line_width=1)
+    fig_site.add_hline(y=50, line_dash='dash', line_color='#666',
+        annotation_text='50%', annotation_font_color='#aaa')
+    fig_site.update_layout(
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#E63946'),
+        title_font=dict(size=18, color='#E63946'),
+        xaxis=dict(tickfont=dict(color='#fff'), gridcolor='#333'),
+        yaxis=dict(range=[0, 115], tickfont=dict(color='#fff'), gridcolor='#333', title='Win Rate (%)'),
+        legend=dict(font=dict(color='#fff')),
+        bargap=0.25
+    )
+    return fig_site
+
+
+def tempo_figure(tempo_overall: pd.DataFrame) -> go.Figure:
+    """Attack win rate per engagement-tempo bucket, as a line."""
+    fig_tempo = go.Figure()
+    fig_tempo.add_trace(go.Scatter(
+        x=tempo_overall['Tempo'].astype(str),
+        y=tempo_overall['Win Rate %'],
+        mode='lines+markers+text',
+        line=dict(color='#E63946', width=2.5),
+        marker=dict(
+            size=12,
+            color=[TEMPO_COLORS.get(str(t), '#aaa') for t in tempo_overall['Tempo']],
+            line=dict(color='#000', width=1.5)
+        ),
+        text=tempo_overall['Win Rate %'].map('{:.0f}%'.format) + '  (n=' + tempo_overall['Rounds'].astype(str) + ')',
+        textposition='top center',
+        textfont=dict(color='#ffffff', size=12),
+    ))
+    fig_tempo.add_hline(y=50, line_dash='dash', line_color='#666',
+        annotation_text='50%', annotation_font_color='#aaa')
+    fig_tempo.update_layout(
+        title='Attack Win Rate by Engagement Tempo',
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#E63946'),
+        title_font=dict(size=18, color='#E63946'),
+        xaxis=dict(
+            tickfont=dict(color='#fff', size=13), gridcolor='#333',
+            categoryorder='array', categoryarray=TEMPO_LABELS
+        ),
+        yaxis=dict(range=[0, 115], tickfont=dict(color='#fff'), gridcolor='#333', title='Win Rate (%)'),
+    )
+    return fig_tempo
+
+
+def tempo_heatmap_figure(map_tempo: pd.DataFrame) -> go.Figure:
+    """Map × tempo attack win-rate heatmap from a (Map, Tempo) tempo summary."""
+    labels = TEMPO_LABELS
+    pivot = map_tempo.pivot(index='Map', columns='Tempo', values='Win Rate %')
+    pivot_n = map_tempo.pivot(index='Map', columns='Tempo', values='Rounds')
+    pivot = pivot.reindex(columns=labels)
+    pivot_n = pivot_n.reindex(columns=labels)
+
+    z = pivot.values.tolist()
+    maps_list = pivot.index.tolist()
+    customdata = []
+    for map_name in maps_list:
+        row_custom = []
+        for tempo in labels:
+            wr = pivot.loc[map_name, tempo] if tempo in pivot.columns else None
+            n  = pivot_n.loc[map_name, tempo] if tempo in pivot_n.columns else 0
+            if pd.isna(wr):
+                row_custom.append("No data")
+            else:
+                row_custom.append(f"{wr:.0f}% (n={int(n)})")
+        customdata.append(row_custom)
+
+    text_vals = []
+    for map_name in maps_list:
+        row_text = []
+        for tempo in labels:
+            wr = pivot.loc[map_name, tempo] if tempo in pivot.columns else None
+            row_text.append(f"{wr:.0f}%" if pd.notna(wr) else "")
+        text_vals.append(row_text)
+
+    fig_heat_tempo = go.Figure(data=go.Heatmap(
+        z=z,
+        x=labels,
+        y=maps_list,
+        customdata=customdata,
+        colorscale=[[0, '#7f1d1d'], [0.5, '#fef08a'], [1, '#14532d']],
+        zmid=50,
+        zmin=0, zmax=100,
+        text=text_vals,
+        texttemplate='%{text}',
+        textfont=dict(family='Rajdhani', size=13, color='white'),
+        hovertemplate='Map: %{y}<br>Tempo: %{x}<br>%{customdata}<extra></extra>',
+    ))
+    fig_heat_tempo.update_layout(
+        title='Attack Win Rate % by Map & Tempo',
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#E63946'),
+        title_font=dict(size=18, color='#E63946'),
+        xaxis=dict(tickfont=dict(color='#fff', size=12), side='bottom'),
+        yaxis=dict(tickfont=dict(color='#fff'), autorange='reversed'),
+        height=max(300, 55 * len(maps_list) + 120),
+    )
+    return fig_heat_tempo
+
+
+# ── Pistol ─────────────────────────────────────────────────────────────────────
+def pistol_figure(grouped: pd.DataFrame) -> go.Figure:
+    """Pistol win rate per map from pistol_summary."""
+    fig_pistol = px.bar(
+        grouped, x='Map', y='Pistol Win Rate (%)',
+        text=grouped['Pistol Win Rate (%)'].apply(lambda x: f"{x:.1f}%"),
+        color='Pistol Win Rate (%)', color_continuous_scale=['#450a0a', '#E63946'],
+        title="Pistol Win Rates by Map"
+    )
+    fig_pistol.update_traces(textposition='outside', marker_line_color='#000000', marker_line_width=1.2)
+    fig_pistol.update_layout(
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', size=14, color='#E63946'),
+        title_font=dict(size=20, color='#E63946'),
+        xaxis=dict(tickfont=dict(color='#ffffff'), gridcolor='#333333'),
+        yaxis=dict(range=[0,100], title='Win Rate (%)', title_font=dict(color='#E63946'), tickfont=dict(color='#ffffff'), gridcolor='#333333')
+    )
+    return fig_pistol
+
+
+def conversion_pie_figure(map_conversions: pd.DataFrame, map_name: str, after_win: bool) -> go.Figure | None:
+    """2nd-round outcomes after a won (WW/WL) or lost (LL/LW) pistol on one map; None if there are none."""
+    codes = ['WW', 'WL'] if after_win else ['LL', 'LW']
+    rows = map_conversions[map_conversions['Conversion'].isin(codes)]
+    if rows.empty:
+        return None
+    pie_data = rows['Conversion'].value_counts(normalize=True).reset_index()
+    pie_data.columns = ['Conversion', 'Percentage']
+    pie_data['Percentage'] *= 100
+    if after_win:
+        title, colors = f"Pistol Conversion - {map_name}", {'WW': '#E63946', 'WL': '#666666'}
+    else:
+        title, colors = f"Eco Round Outcomes - {map_name}", {'LL': '#444444', 'LW': '#3b82f6'}
+    fig_pie = px.pie(pie_data, names='Conversion', values='Percentage',
+        title=title, color='Conversion',
+        color_discrete_map=colors, hole=0.4)
+    fig_pie.update_traces(textinfo='label+percent', marker_line_color='#000000', marker_line_width=1.5)
+    fig_pie.update_layout(plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', size=14, color='#E63946'),
+        title_font=dict(size=18, color='#E63946'), legend=dict(font=dict(color='#ffffff')))
+    return fig_pie
+
+
+# ── Players ────────────────────────────────────────────────────────────────────
+def acs_beeswarm_figure(rows: pd.DataFrame, player: str):
+    """matplotlib swarm of one player's ACS per map, coloured by agent, with their average."""
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+    avg_acs = rows['ACS'].mean()
+    fig_bee, ax = plt.subplots(figsize=(10, 5))
+    fig_bee.patch.set_facecolor('#000000')
+    ax.set_facecolor('#000000')
+    ax.spines['top'].set_visible(False); ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color('#ffffff'); ax.spines['bottom'].set_color('#ffffff')
+    # Plain strings: seaborn would give every category of the shared table a slot and a hue.
+    rows = rows.astype({'Map': str, 'Agent': str})
+    palette = sns.color_palette("husl", len(rows['Agent'].unique()))
+    sns.swarmplot(data=rows, x='Map', y='ACS', hue='Agent', palette=palette, ax=ax)
+    ax.axhline(avg_acs, color='#E63946', linestyle='--', linewidth=1.5)
+    ax.text(x=0.5, y=avg_acs+2, s=f"Avg ACS: {avg_acs:.1f}", color='#E63946', fontsize=10)
+    ax.set_title(f"{player}'s ACS by Agent & Map", color='#E63946', fontsize=14)
+    ax.set_ylabel("ACS", color='white'); ax.set_xlabel("Map", color='white')
+    ax.tick_params(colors='white')
+    ax.legend(title="Agent", loc='best', facecolor='#1a1a1a', labelcolor='white', title_fontsize=10, fontsize=9)
+    return fig_bee
+
+
+def radar_figure(role_agents: pd.DataFrame, role: str, player: str) -> go.Figure:
+    """The player's averages over one role's agents (compare_agent_stats rows) against that role's VCT benchmark."""
+    benchmark  = VCT_BENCHMARKS[role]
+    player_avg = role_averages(role_agents, benchmark)
+    categories, player_values, benchmark_values = radar_values(player_avg, benchmark)
+
+    fig_radar = go.Figure()
+    fig_radar.add_trace(go.Scatterpolar(r=player_values,    theta=categories, fill='toself', name=player,             line=dict(color="#E63946")))
+    fig_radar.add_trace(go.Scatterpolar(r=benchmark_values, theta=categories, fill='toself', name=f"VCT {role} Avg", line=dict(color="#444444")))
+
+    raw_values = []
+    for stat in categories:
+        val   = player_avg[stat]
+        bmark = benchmark[stat]
+        diff  = val - bmark
+        sign  = '+' if diff >= 0 else ''
+        color = "#14532d" if diff >= 0 else "#7f1d1d"
+        if stat in ['FBSR','FKPR','Atk_Entry']:
+            raw_values.append(f"<span style='color:{color}'><b>{stat}</b>: {sign}{diff*100:.1f}%</span>")
+        else:
+            raw_values.append(f"<span style='color:{color}'><b>{stat}</b>: {sign}{diff:.2f}</span>")
+
+    fig_radar.add_annotation(
+        text="<br>".join(raw_values), showarrow=False, align="left",
+        x=0.95, y=0.95, xref="paper", yref="paper",
+        bordercolor="#666", borderwidth=1, bgcolor="rgba(0,0,0,0.85)",
+        font=dict(color="white", size=12)
+    )
+    fig_radar.update_layout(
+        polar=dict(
+            bgcolor="#000000",
+            radialaxis=dict(visible=False, showticklabels=False, ticks='', showline=False, gridcolor="#333333"),
+            angularaxis=dict(tickfont=dict(color="#E63946"))
+        ),
+        showlegend=True, legend=dict(font=dict(color="#ffffff")),
+        plot_bgcolor='#000000', paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#E63946'),
+        title=dict(text=f"{role} Stats vs VCT Benchmark", font=dict(size=16, color='#E63946')),
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    return fig_radar
@@ -0,0 +1,152 @@
+"""Load a folder of per-day exports (round sheets, form and ACS files) across a process pool.
+
+    python -m scrim_analytics.folders exports/ --workers 8
+
+Files are told apart by their header row (see EXPORT_KINDS); anything else is
+skipped. Each worker loads one file through the usual read_* loaders, so every
+file has its own on-disk cache entry and a folder where only today's export is new
+parses just that file. Match aggregation runs in the workers too, per file. The
+parent stacks each kind in file-name order, as if the files were pasted one after
+another into a single sheet: source row numbers continue from file to file, labels
+are categorised over every file (schema.concat_compact), and a match whose rounds
+are split across files is re-aggregated from the stacked rounds. The tables come
+out as read_rounds / read_matches / read_player_form / read_acs would give for that
+single sheet.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .dates import sort_by_date
+from .loaders import _match_types, read_acs, read_matches, read_player_form, read_rounds
+from .matches import MATCH_KEY, _lookup, aggregate_matches
+from .schema import concat_compact
+
+# Header columns that identify each kind of export, checked in this order.
+EXPORT_KINDS = {
+    'rounds': {'Map', 'Team', 'Round', 'Side', 'Result'},
+    'form':   {'Player', 'Agent', 'Kills', 'Deaths'},
+    'foracs': {'Map', 'Player', 'ACS', 'Agent'},
+}
+READERS = {'form': read_player_form, 'foracs': read_acs}
+
+
+def export_kind(path: str) -> str | None:
+    """'rounds' / 'form' / 'foracs' from `path`'s header row, or None if it is none of them."""
+    header = {c.strip() for c in pd.read_csv(path, nrows=0).columns}
+    return next((kind for kind, needs in EXPORT_KINDS.items() if needs <= header), None)
+
+
+def export_files(folder: str) -> dict[str | None, list[str]]:
+    """The folder's CSVs grouped by export_kind (None: unrecognised), each list in name order."""
+    files = {}
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.lower().endswith('.csv') and not name.startswith('.') and os.path.isfile(path):
+            files.setdefault(export_kind(path), []).append(path)
+    return files
+
+
+def _load(kind, path):
+    """One export's typed table, plus its matches for a round sheet (runs in a worker)."""
+    if kind == 'rounds':
+        rounds = read_rounds(path)
+        return rounds, read_matches(path, rounds=rounds)
+    return READERS[kind](path), None
+
+
+def stack_tables(tables: list[pd.DataFrame], paths: list[str] | None = None) -> pd.DataFrame:
+    """Loaded tables of one kind as a single date-sorted table, source row numbers continuing across them."""
+    first = tables[0]
+    parts, offset = [], 0
+    for i, table in enumerate(tables):
+        if list(table.columns) != list(first.columns):
+            where = paths[i] if paths else f"table {i}"
+            raise ValueError(f"{where} doesn't have the same columns as the first export")
+        parts.append(table.set_axis(table.index + offset))
+        offset += len(table)
+    return sort_by_date(concat_compact(parts))
+
+
+def stack_matches(tables: list[pd.DataFrame], rounds: pd.DataFrame) -> pd.DataFrame:
+    """Per-file match tables as one, re-aggregating from the stacked `rounds` any match split across files.
+
+    A split match takes the place of its first part, which is where aggregating the
+    single sheet would have put it.
+    """
+    matches = pd.concat(tables, ignore_index=True)
+    split = matches.duplicated(MATCH_KEY, keep=False).to_numpy()
+    if split.any():
+        first = split & ~matches.duplicated(MATCH_KEY).to_numpy()
+        keys = matches.loc[first, MATCH_KEY]
+        fresh = _match_types(aggregate_matches(rounds[_lookup(rounds, keys.assign(_hit=True), '_hit').notna()]))
+        order = np.concatenate([np.flatnonzero(~split),
+                                _lookup(fresh, keys.assign(_pos=np.flatnonzero(first)), '_pos').to_numpy()])
+        matches = pd.concat([matches[~split], fresh], ignore_index=True).iloc[order.argsort(kind='stable')]
+    return sort_by_date(matches.infer_objects(), ignore_index=True)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (the default worker count)."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def _pool_context():
+    """forkserver where the platform has one (workers fork from a server that already imported this package), else spawn.
+
+    Never a plain fork: the caller may be a threaded server.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def read_folder(folder: str, workers: int | None = None) -> dict[str, pd.DataFrame]:
+    """{'rounds', 'matches', 'form', 'foracs': table} for the exports in `folder` (kinds with no file are left out).
+
+    `workers` processes load the files (default: one per CPU; 1 loads them in this
+    process). Workers come from a fork server or are spawned, never forked from this
+    process, so this is safe to call from a threaded server.
+    """
+    files = export_files(folder)
+    jobs = [(kind, path) for kind in EXPORT_KINDS for path in files.get(kind, [])]
+    workers = min(workers or available_cpus(), len(jobs))
+    if workers <= 1:
+        loaded = [_load(kind, path) for kind, path in jobs]
+    else:
+        with ProcessPoolExecutor(workers, mp_context=_pool_context()) as pool:
+            loaded = list(pool.map(_load, *zip(*jobs), chunksize=max(1, len(jobs) // (workers * 4))))
+
+    tables = {}
+    for kind in EXPORT_KINDS:
+        picked = [(path, result) for (k, path), result in zip(jobs, loaded) if k == kind]
+        if picked:
+            paths = [path for path, _ in picked]
+            tables[kind] = stack_tables([table for _, (table, _) in picked], paths)
+            if kind == 'rounds':
+                tables['matches'] = stack_matches([matches for _, (_, matches) in picked], tables['rounds'])
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", help="folder of per-day round sheet / form / ACS CSVs")
+    parser.add_argument("--workers", type=int, help="processes to load with (default: one per CPU)")
+    args = parser.parse_args()
+    files = export_files(args.folder)
+    for path in files.get(None, []):
+        print(f"skipped {path}: not a round sheet, form or ACS export")
+    for name, table in read_folder(args.folder, args.workers).items():
+        print(f"{name}: {len(table):,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Timing / peak-allocation probes for hot paths.
+
+    with timed("summary: tempo"):
+        ...
+
+    @timed("load: rounds")
+    def load_rounds(path): ...
+
+Probes are live when SCRIM_PROFILE=1 is set or while a `collect()` block is open
+on the current thread (one dashboard run). Otherwise `timed` costs a flag check.
+Each finished probe is logged as a JSON line on the "scrim_analytics.perf" logger.
+Peak memory comes from tracemalloc, which slows allocation-heavy code down a
+lot, so it is only traced with SCRIM_PROFILE_MEMORY=1 (or `enable(memory=True)`).
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+log = logging.getLogger("scrim_analytics.perf")
+
+ENABLED      = os.environ.get("SCRIM_PROFILE", "") not in ("", "0")
+TRACE_MEMORY = os.environ.get("SCRIM_PROFILE_MEMORY", "") not in ("", "0")
+
+_local = threading.local()
+
+
+def enable(on=True, memory=None):
+    """Turn probes on/off process-wide (and memory tracing, when `memory` is given)."""
+    global ENABLED, TRACE_MEMORY
+    ENABLED = on
+    if memory is not None:
+        TRACE_MEMORY = memory
+
+
+def _active():
+    return ENABLED or getattr(_local, "samples", None) is not None
+
+
+@contextmanager
+def collect():
+    """Turn probes on for this thread and yield the list their samples land in."""
+    previous = getattr(_local, "samples", None)
+    _local.samples = samples = []
+    try:
+        yield samples
+    finally:
+        _local.samples = previous
+
+
+def _emit(record):
+    if not log.handlers and not logging.getLogger().handlers:
+        # Nothing configured (plain `streamlit run`); make sure the lines are visible.
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    log.info(json.dumps(record))
+    samples = getattr(_local, "samples", None)
+    if samples is not None:
+        samples.append(record)
+
+
+class timed:
+    """Context manager and decorator timing `section` (plus peak allocation when traced)."""
+
+    def __init__(self, section):
+        self.section = section
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active():
+                return fn(*args, **kwargs)
+            with timed(self.section):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        self.live = _active()
+        if not self.live:
+            return self
+        stack = _local.__dict__.setdefault("stack", [])
+        self.memory = TRACE_MEMORY
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(getattr(stack[-1], "peak", 0), peak)  # keep the parent's peak before resetting
+            tracemalloc.reset_peak()
+            self.base = self.peak = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.live:
+            return False
+        seconds = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        record = {"section": self.section, "ms": round(seconds * 1000, 3), "depth": len(stack)}
+        if self.memory and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(getattr(stack[-1], "peak", 0), self.peak)
+            record["peak_kib"] = round((self.peak - self.base) / 1024, 1)
+        _emit(record)
+        return False
@@ -0,0 +1,79 @@
+"""Read the source CSVs into typed tables, through the on-disk cache.
+
+The round sheet only ever grows between scrim blocks, so the round and match
+tables are extended from the appended rows rather than rebuilt when that is all
+that changed (see cache.disk_cached). A full build reads it in chunks (see
+streaming), so a multi-season sheet is never held as text all at once.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from .cache import disk_cached
+from .compositions import build_composition_index
+from .dates import sort_by_date
+from .matches import MATCH_KEY, _lookup, aggregate_matches, merge_matches
+from .players import normalize_acs, normalize_player_form
+from .rounds import append_rounds, normalize_rounds
+from .streaming import CHUNK_ROWS, match_rounds, stream_matches, stream_rounds
+
+
+def read_rounds(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Normalized round table from the round sheet, read `chunksize` rows at a time."""
+    return disk_cached("rounds", path, lambda: stream_rounds(path, chunksize),
+                       extend=lambda rounds, new: append_rounds(rounds, normalize_rounds(new)))
+
+
+def read_matches(path: str, rounds: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Match-level rows aggregated from the round sheet (pass `rounds` to reuse a parsed table).
+
+    Without `rounds`, the round table is never built. A full build streams the
+    sheet. Appended rows are merged with only the rounds of the matches they touch:
+    none of the old rows when they only start new matches, otherwise those matches'
+    rows from one chunked pass over the sheet.
+    """
+    def build():
+        if rounds is None:
+            return stream_matches(path)
+        return sort_by_date(aggregate_matches(rounds), ignore_index=True)
+
+    def extend(matches, new):
+        new_rounds = normalize_rounds(new)
+        touched = _touched_rounds(path, matches, new_rounds) if rounds is None else rounds
+        return merge_matches(matches, touched, new_rounds)
+
+    return _match_types(disk_cached("matches", path, build, extend=extend))
+
+
+def _touched_rounds(path, matches, new_rounds):
+    """Every round of the matches `new_rounds` touch: just `new_rounds` when none of them is in `matches` yet."""
+    keys = new_rounds[MATCH_KEY].dropna().drop_duplicates()
+    if _lookup(keys, matches[MATCH_KEY].assign(_old=True), '_old').isna().all():
+        return new_rounds
+    return match_rounds(path, keys)
+
+
+def _match_types(matches):
+    """Parsed dates and integer tiers on an aggregated match table, in place."""
+    matches['Date'] = pd.to_datetime(matches['Date'], errors='coerce')
+    # Untiered scrims count as Tier 1
+    if 'Tier' in matches.columns:
+        matches['Tier'] = pd.to_numeric(matches['Tier'], errors='coerce').fillna(1).astype(int)
+    else:
+        matches['Tier'] = 1
+    return matches
+
+
+def read_player_form(path: str) -> pd.DataFrame:
+    """Player-match rows (one per player per match) from form.csv."""
+    return disk_cached("form", path, lambda: normalize_player_form(pd.read_csv(path)))
+
+
+def read_acs(path: str) -> pd.DataFrame:
+    """Per-player ACS rows from foracs.csv."""
+    return disk_cached("foracs", path, lambda: normalize_acs(pd.read_csv(path)))
+
+
+def read_compositions(form_path: str, rounds_path: str) -> pd.DataFrame:
+    """Composition index built from form.csv and the round sheet."""
+    return build_composition_index(read_player_form(form_path), read_matches(rounds_path))
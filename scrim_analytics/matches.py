@@ -0,0 +1,269 @@
+"""Match-grain table: aggregation from rounds and the per-map summaries built on it."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .dates import date_slice, sort_by_date
+
+MATCH_KEY = ['Map', 'Team', 'Date']
+MATCH_COLUMNS = [
+    'Date', 'Map', 'Team', 'Start',
+    'First Pistol', 'First Rounds', 'First Half WR',
+    'Second Pistol', 'Second Rounds', 'Second Half WR',
+    'Atk_PP_Success', 'Def_PP_Success',
+    'Atk_PP_A', 'Atk_PP_B', 'Atk_PP_C',
+    'Def_PP_A', 'Def_PP_B', 'Def_PP_C',
+    'Atk 2nd', 'Def 2nd', 'Outcome', 'Tier',
+    'Atk WR Derived', 'Def WR Derived', 'Total Pistols Won'
+]
+
+
+def _or_none(s):
+    """Object copy of `s` with missing values as None (matches the old per-match records)."""
+    return s.astype(object).where(s.notna(), None)
+
+
+def _rate(wins, n, empty):
+    """wins / n rounded to 2dp, or `empty` where n is zero."""
+    return (wins / n.where(n > 0)).round(2).astype(object).where(n > 0, empty)
+
+
+def aggregate_matches(raw: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate normalized round rows into one row per (Map, Team, Date) match.
+
+    Every per-match stat is a grouped sum over precomputed boolean columns (or a
+    lookup of a specific round number), so the cost is a few groupby passes over
+    the whole sheet instead of a dozen re-filters per match.
+    """
+    match_id = raw.groupby(MATCH_KEY, sort=False, observed=True).ngroup()
+    rounds = raw.assign(_match=match_id)[match_id >= 0]
+    rounds = rounds.sort_values(['_match', 'Round'], kind='stable')
+
+    result  = rounds['Result'].str.lower()
+    planted = rounds['Planted']
+    atk     = rounds['Side'] == 'Attack'
+    dfn     = rounds['Side'] == 'Defence'
+    flags = pd.DataFrame({
+        '_match':      rounds['_match'],
+        'won':         result == 'win',
+        'lost':        result == 'loss',
+        'first_half':  rounds['Round'] <= 12,
+        'second_half': rounds['Round'] >= 13,
+        'atk_plant':   planted & atk,
+        'def_plant':   planted & dfn,
+    })
+    flags['first_won']  = flags['first_half']  & flags['won']
+    flags['second_won'] = flags['second_half'] & flags['won']
+    flags['atk_plant_won'] = flags['atk_plant'] & flags['won']
+    flags['def_plant_won'] = flags['def_plant'] & flags['won']
+    for site in ['A', 'B', 'C']:
+        at_site = rounds['Site'] == site
+        flags[f'atk_{site}']     = flags['atk_plant'] & at_site
+        flags[f'def_{site}']     = flags['def_plant'] & at_site
+        flags[f'atk_{site}_won'] = flags[f'atk_{site}'] & flags['won']
+        flags[f'def_{site}_won'] = flags[f'def_{site}'] & flags['won']
+
+    grouped = rounds.groupby('_match', sort=True)
+    totals  = flags.groupby('_match', sort=True).sum()
+    out = grouped[['Date', 'Map', 'Team']].first()
+
+    def round_won(round_num):
+        # Result of the first row carrying this round number; NaN if the round is missing.
+        r = flags[rounds['Round'] == round_num].drop_duplicates('_match').set_index('_match')['won']
+        return r.reindex(out.index)
+
+    def conversion(pistol_won, round_num):
+        won = round_won(round_num)
+        code = pd.Series(np.where(pistol_won == 1, 'W', 'L'), index=out.index) + np.where(won == True, 'W', 'L')
+        return _or_none(code.where(won.notna()))
+
+    r1_won  = round_won(1)
+    r13_won = round_won(13)
+    start   = rounds[rounds['Round'] == 1].drop_duplicates('_match').set_index('_match')['Side'].reindex(out.index)
+    out['Start']          = _or_none(start)
+    out['First Pistol']   = (r1_won  == True).astype(int)
+    out['First Rounds']   = totals['first_won']
+    out['First Half WR']  = _rate(totals['first_won'], totals['first_half'], None)
+    out['Second Pistol']  = (r13_won == True).astype(int)
+    out['Second Rounds']  = totals['second_won']
+    out['Second Half WR'] = _rate(totals['second_won'], totals['second_half'], None)
+    out['Atk_PP_Success'] = _rate(totals['atk_plant_won'], totals['atk_plant'], 0)
+    out['Def_PP_Success'] = _rate(totals['def_plant_won'], totals['def_plant'], 0)
+    for site in ['A', 'B', 'C']:
+        out[f'Atk_PP_{site}'] = _rate(totals[f'atk_{site}_won'], totals[f'atk_{site}'], None)
+        out[f'Def_PP_{site}'] = _rate(totals[f'def_{site}_won'], totals[f'def_{site}'], None)
+
+    attack_start = out['Start'] == 'Attack'
+    opening   = conversion(out['First Pistol'],  2)
+    second    = conversion(out['Second Pistol'], 14)
+    out['Atk 2nd'] = opening.where(attack_start, second)
+    out['Def 2nd'] = second.where(attack_start, opening)
+    out['Outcome'] = np.select(
+        [totals['won'] > totals['lost'], totals['lost'] > totals['won']], ['Win', 'Loss'], 'Draw'
+    )
+    out['Tier'] = _or_none(grouped['Tier'].first()) if 'Tier' in rounds.columns else None
+
+    out[['Map', 'Team']] = out[['Map', 'Team']].astype(object)
+    out = out.reset_index(drop=True).infer_objects()
+    out['Atk WR Derived'], out['Def WR Derived'] = side_win_rates(out)
+    out['Total Pistols Won'] = out['First Pistol'] + out['Second Pistol']
+    return out[[c for c in MATCH_COLUMNS if c in out.columns]]
+
+
+def merge_matches(matches: pd.DataFrame, rounds: pd.DataFrame, new_rounds: pd.DataFrame) -> pd.DataFrame:
+    """`matches` updated for appended `new_rounds`, re-aggregating only the matches they touch.
+
+    `rounds` is the full round table, appended rows included. A touched match keeps its
+    place and new matches go after the ones already on their date — the order
+    aggregate_matches gives the whole sheet.
+    """
+    keys = new_rounds[MATCH_KEY].dropna().drop_duplicates()
+    if keys.empty:
+        return matches
+    nearby = date_slice(rounds, keys['Date'].min(), keys['Date'].max())
+    fresh = aggregate_matches(nearby[_lookup(nearby, keys.assign(_hit=True), '_hit').notna()])
+
+    # Old position of each re-aggregated match; brand-new ones rank after every old row.
+    pos = _lookup(fresh, matches[MATCH_KEY].assign(_pos=np.arange(len(matches))), '_pos')
+    rank = np.where(pos.notna(), pos, len(matches) + np.arange(len(fresh)))
+    kept = np.ones(len(matches), dtype=bool)
+    kept[pos.dropna().astype(int)] = False
+    merged = pd.concat([matches[kept], fresh], ignore_index=True)
+    order = np.concatenate([np.flatnonzero(kept), rank]).argsort(kind='stable')
+    return sort_by_date(merged.iloc[order].infer_objects(), ignore_index=True)
+
+
+def _lookup(frame, table, column):
+    """`table[column]` for each row of `frame`, joined on MATCH_KEY (NaN where `table` has no such match)."""
+    plain = {'Map': object, 'Team': object}  # categorical in the round table, object in the match table
+    joined = frame[MATCH_KEY].astype(plain).merge(table.astype(plain), on=MATCH_KEY, how='left')
+    return joined[column].set_axis(frame.index)
+
+
+def outcome_flags(outcomes: pd.Series) -> pd.DataFrame:
+    """Boolean _win/_draw/_loss columns for an Outcome/Result series, to sum in a groupby."""
+    lowered = outcomes.str.lower()
+    return pd.DataFrame({'_win': lowered == 'win', '_draw': lowered == 'draw', '_loss': lowered == 'loss'},
+                        index=outcomes.index)
+
+
+def select_matches(matches: pd.DataFrame, tiers: Iterable[int], start_date: date | None = None,
+                   end_date: date | None = None, map_name: str = "All") -> pd.DataFrame:
+    """Matches in the given tiers, date range (inclusive) and map ("All" = every map)."""
+    out = date_slice(matches, start_date, end_date) if start_date and end_date else matches
+    out = out[out['Tier'].isin(tiers)]
+    if map_name != "All":
+        out = out[out['Map'] == map_name]
+    return out
+
+
+def map_outcome_summary(matches: pd.DataFrame) -> pd.DataFrame:
+    """Games / wins / draws / losses and win rate per map."""
+    summary = matches.join(outcome_flags(matches['Outcome'])).groupby('Map').agg(
+        Games=('Outcome', 'count'), Wins=('_win', 'sum'), Draws=('_draw', 'sum'), Losses=('_loss', 'sum')
+    ).reset_index()
+    summary['Win Rate'] = summary['Wins'] / summary['Games']
+    return summary
+
+
+def map_tier_summary(matches: pd.DataFrame) -> pd.DataFrame:
+    """Win rate per (Map, Tier)."""
+    summary = matches.assign(_win=matches['Outcome'].str.lower() == 'win').groupby(['Map', 'Tier']).agg(
+        Games=('Outcome', 'count'), Wins=('_win', 'sum')
+    ).reset_index()
+    summary['Win Rate %'] = summary['Wins'] / summary['Games'] * 100
+    summary['Tier Label'] = 'Tier ' + summary['Tier'].astype(str)
+    return summary
+
+
+def side_win_rates(matches: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """(attack, defence) win rate of the half played on each side.
+
+    Unknown (NaN) when the starting side or either half's win rate is missing.
+    """
+    first, second, start = matches['First Half WR'], matches['Second Half WR'], matches['Start']
+    known = start.notna() & first.notna() & second.notna()
+    return (first.where(start == 'Attack', second).where(known),
+            first.where(start == 'Defence', second).where(known))
+
+
+def tier_games(matches: pd.DataFrame) -> pd.DataFrame:
+    """Games and wins per opponent tier (the sidebar's tier list)."""
+    wins = matches['Outcome'].str.lower().eq('win')
+    return wins.groupby(matches['Tier']).agg(Games='size', Wins='sum').reset_index()
+
+
+def with_side_win_rates(matches: pd.DataFrame) -> pd.DataFrame:
+    """`matches` with Atk/Def WR Derived (see side_win_rates).
+
+    aggregate_matches already adds them, so its tables come back as they are;
+    only a frame without the columns is copied.
+    """
+    if {'Atk WR Derived', 'Def WR Derived'} <= set(matches.columns):
+        return matches
+    atk, dfn = side_win_rates(matches)
+    return matches.assign(**{'Atk WR Derived': atk, 'Def WR Derived': dfn})
+
+
+def round_insights_summary(matches: pd.DataFrame) -> pd.DataFrame:
+    """Per-map games, results, average Atk/Def WR and post-plant rates (raw fractions)."""
+    agg_dict = {
+        'Games':       ('Outcome', 'count'),
+        'Wins':        ('_win', 'sum'),
+        'Draws':       ('_draw', 'sum'),
+        'Losses':      ('_loss', 'sum'),
+        'Avg_Atk_WR':  ('Atk WR Derived', 'mean'),
+        'Avg_Def_WR':  ('Def WR Derived', 'mean'),
+    }
+    if 'Atk_PP_Success' in matches.columns:
+        agg_dict['Atk_PP_Success'] = ('Atk_PP_Success', 'mean')
+    if 'Def_PP_Success' in matches.columns:
+        agg_dict['Def_PP_Success'] = ('Def_PP_Success', 'mean')
+
+    return _round_wr_columns(matches.join(outcome_flags(matches['Outcome'])).groupby('Map').agg(**agg_dict).reset_index())
+
+
+def _round_wr_columns(summary):
+    """Raw attack / defence / round win rates on a per-map insights summary."""
+    summary['Raw_Atk_WR']   = summary['Avg_Atk_WR']
+    summary['Raw_Def_WR']   = summary['Avg_Def_WR']
+    summary['Raw_Round_WR'] = (summary['Raw_Atk_WR'] + summary['Raw_Def_WR']) / 2
+    return summary
+
+
+def post_plant_summary(matches: pd.DataFrame) -> pd.DataFrame:
+    """Mean attack post-plant and defence retake success per map."""
+    return matches.groupby('Map').agg({
+        'Atk_PP_Success': 'mean',
+        'Def_PP_Success': 'mean'
+    }).reset_index()
+
+
+def pistol_summary(matches: pd.DataFrame) -> pd.DataFrame:
+    """Pistol rounds won / played and win rate per map, best first."""
+    if 'Total Pistols Won' not in matches.columns:
+        matches = matches.assign(**{'Total Pistols Won': matches['First Pistol'] + matches['Second Pistol']})
+    grouped = matches.groupby('Map').agg(
+        Total_Pistols_Won=('Total Pistols Won', 'sum'),
+        Total_Pistols_Played=('Map', 'count')
+    ).reset_index()
+    return _pistol_rates(grouped)
+
+
+def _pistol_rates(grouped):
+    """Per-map pistol wins / games as rounds played and win rate, best first."""
+    grouped['Total_Pistols_Played'] *= 2
+    grouped['Pistol Win Rate (%)'] = (grouped['Total_Pistols_Won'] / grouped['Total_Pistols_Played']) * 100
+    return grouped.sort_values(by='Pistol Win Rate (%)', ascending=False)
+
+
+def second_round_conversions(matches: pd.DataFrame) -> pd.DataFrame:
+    """Long (Map, Conversion) table of every 2nd-round code (WW/WL/LW/LL), both sides."""
+    return pd.concat([
+        matches[['Map', 'Atk 2nd']].rename(columns={'Atk 2nd': 'Conversion'}),
+        matches[['Map', 'Def 2nd']].rename(columns={'Def 2nd': 'Conversion'})
+    ])
@@ -0,0 +1,221 @@
+"""Partitioned storage of the round, match and player tables for many rosters and seasons.
+
+    python -m scrim_analytics.partitions data/ --roster Wolves \\
+        --rounds Advanced_Data-_Sheet1.csv --form form.csv --foracs foracs.csv
+    python -m scrim_analytics.partitions data/ --roster Academy --folder exports/academy/
+
+Each dataset lives under ``{root}/{dataset}/roster=…/season=…/month=YYYY-MM/`` (season
+is the calendar year; undated rows go to ``season=undated/month=undated``), with a
+``_manifest.json`` listing every partition's rows and date range, and for rounds and
+matches the opponent tiers it holds (matches also keep games / wins per tier, so
+the sidebar doesn't have to read any rows). scan_partitions reads the manifest first
+and opens only the partitions the roster, tiers and date range can touch.
+
+Partitions keep the typed tables' index (source row numbers), so scanning a roster
+gives back the table its CSV loads to, or the part of it the filters kept. Ingesting
+a roster again replaces its partitions, rewriting only those whose rows changed.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from datetime import date
+from typing import Iterable
+from urllib.parse import quote
+
+import pandas as pd
+
+from .cache import CACHE_EXT, _read_table, _write_table
+from .dates import sort_by_date
+from .folders import read_folder
+from .loaders import read_acs, read_matches, read_player_form, read_rounds
+from .matches import tier_games
+
+STORE_VERSION = 1  # bump when a partition's layout or the manifest changes; re-ingest afterwards
+MANIFEST = "_manifest.json"
+UNDATED = "undated"
+FILE_ORDER_DATASETS = ('rounds', 'form', 'foracs')  # indexed by source row; matches are not
+
+
+def manifest_path(root: str, dataset: str) -> str:
+    return os.path.join(root, dataset, MANIFEST)
+
+
+def read_manifest(root: str, dataset: str) -> list[dict]:
+    """Partition entries of `dataset` under `root` ([] when it was never written)."""
+    try:
+        with open(manifest_path(root, dataset)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return []
+    if manifest["version"] != STORE_VERSION:
+        raise ValueError(f"{manifest_path(root, dataset)} is store version {manifest['version']}, "
+                         f"expected {STORE_VERSION}; ingest the CSVs again")
+    return manifest["partitions"]
+
+
+def _write_manifest(root, dataset, partitions):
+    path = manifest_path(root, dataset)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"version": STORE_VERSION, "partitions": partitions}, f, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def partition_keys(dates: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """(season, month) label of every row: calendar year and YYYY-MM, 'undated' for NaT."""
+    return (dates.dt.year.astype('Int64').astype(str).where(dates.notna(), UNDATED),
+            dates.dt.strftime('%Y-%m').where(dates.notna(), UNDATED))
+
+
+def _digest(part):
+    return hashlib.sha1(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes()).hexdigest()
+
+
+def _entry(dataset, roster, season, month, part):
+    """Manifest entry for one partition's rows."""
+    dates = part['Date'].dropna()
+    entry = {
+        "path": f"roster={quote(roster, safe='')}/season={season}/month={month}/part.{CACHE_EXT}",
+        "roster": roster, "season": season, "month": month, "rows": len(part),
+        "date_min": dates.min().date().isoformat() if len(dates) else None,
+        "date_max": dates.max().date().isoformat() if len(dates) else None,
+        "tiers": None, "digest": _digest(part),
+    }
+    if 'Tier' in part.columns and dataset in ('rounds', 'matches'):
+        tiers = part['Tier'].fillna(1).astype(int)  # untiered scrims count as Tier 1
+        entry["tiers"] = sorted(int(t) for t in tiers.unique())
+        if dataset == 'matches':
+            games = tier_games(part.assign(Tier=tiers))
+            entry["tier_games"] = {str(t): [int(g), int(w)] for t, g, w in games.itertuples(index=False)}
+    return entry
+
+
+def write_partitions(table: pd.DataFrame, root: str, dataset: str, roster: str) -> list[str]:
+    """Replace `roster`'s partitions of `dataset` with `table`'s rows; returns the partition paths (re)written."""
+    entries = read_manifest(root, dataset)
+    previous = {e["path"]: e for e in entries if e["roster"] == roster}
+    folder = os.path.join(root, dataset)
+    os.makedirs(folder, exist_ok=True)
+    written, current = [], []
+    season, month = partition_keys(table['Date'])
+    for (s, m), part in table.groupby([season, month], sort=True):
+        entry = _entry(dataset, roster, s, m, part)
+        target = os.path.join(folder, entry["path"])
+        if previous.get(entry["path"], {}).get("digest") != entry["digest"] or not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _write_table(part, target)
+            written.append(entry["path"])
+        current.append(entry)
+    for path in previous.keys() - {e["path"] for e in current}:
+        shutil.rmtree(os.path.dirname(os.path.join(folder, path)), ignore_errors=True)
+    others = [e for e in entries if e["roster"] != roster]
+    _write_manifest(root, dataset, sorted(others + current, key=lambda e: (e["roster"], e["season"], e["month"])))
+    return written
+
+
+def prune_partitions(entries: list[dict], roster: str, tiers: Iterable[int] | None = None,
+                     start_date: date | None = None, end_date: date | None = None,
+                     keep_undated: bool = False) -> list[dict]:
+    """Entries of `roster` that can hold rows in `tiers` dated within [start_date, end_date].
+
+    Undated partitions are kept when no date bound is given, or with `keep_undated`.
+    """
+    tiers = None if tiers is None else {int(t) for t in tiers}
+    start = pd.Timestamp(start_date).date().isoformat() if start_date else None
+    end = pd.Timestamp(end_date).date().isoformat() if end_date else None
+    kept = []
+    for e in entries:
+        if e["roster"] != roster:
+            continue
+        if tiers is not None and e["tiers"] is not None and not tiers & set(e["tiers"]):
+            continue
+        if e["date_min"] is None:
+            if (start or end) and not keep_undated:
+                continue
+        elif (end and e["date_min"] > end) or (start and e["date_max"] < start):
+            continue
+        kept.append(e)
+    return kept
+
+
+def scan_partitions(root: str, dataset: str, roster: str, tiers: Iterable[int] | None = None,
+                    start_date: date | None = None, end_date: date | None = None,
+                    keep_undated: bool = False) -> pd.DataFrame:
+    """`roster`'s `dataset` rows from only the partitions prune_partitions keeps, sorted by date.
+
+    Rows are not filtered inside a partition; apply the usual select_* helpers to the
+    result. An empty scan still has the dataset's columns.
+    """
+    entries = [e for e in read_manifest(root, dataset) if e["roster"] == roster]
+    if not entries:
+        raise KeyError(f"no {dataset} partitions for roster {roster!r} under {root}")
+    kept = prune_partitions(entries, roster, tiers, start_date, end_date, keep_undated)
+    folder = os.path.join(root, dataset)
+    parts = [_read_table(os.path.join(folder, e["path"])) for e in kept] or \
+            [_read_table(os.path.join(folder, entries[0]["path"])).iloc[:0]]
+    table = pd.concat(parts) if len(parts) > 1 else parts[0]
+    for col in parts[0].columns:
+        if isinstance(parts[0][col].dtype, pd.CategoricalDtype) and table[col].dtype == object:
+            table[col] = table[col].astype('category')  # partitions saw different categories
+    if dataset in FILE_ORDER_DATASETS:
+        return sort_by_date(table.sort_index(kind='stable'))
+    return sort_by_date(table, ignore_index=True)
+
+
+def rosters(root: str) -> list[str]:
+    """Rosters with round data in the store."""
+    return sorted({e["roster"] for e in read_manifest(root, 'rounds')})
+
+
+def store_tier_games(root: str, roster: str) -> pd.DataFrame:
+    """tier_games for `roster`'s matches, from the match manifest alone."""
+    totals = {}
+    for e in read_manifest(root, 'matches'):
+        if e["roster"] == roster:
+            for tier, (games, wins) in e.get("tier_games", {}).items():
+                g, w = totals.get(int(tier), (0, 0))
+                totals[int(tier)] = (g + games, w + wins)
+    return pd.DataFrame([(t, g, w) for t, (g, w) in sorted(totals.items())], columns=['Tier', 'Games', 'Wins'])
+
+
+def ingest(root: str, roster: str, rounds: str | None = None, form: str | None = None,
+           foracs: str | None = None, folder: str | None = None, workers: int | None = None) -> dict[str, list[str]]:
+    """Load the given CSVs and replace `roster`'s partitions with them; {dataset: partition paths rewritten}.
+
+    `folder` is a folder of per-day exports, loaded by `workers` processes (see folders.read_folder).
+    """
+    written = {}
+    if folder:
+        for dataset, table in read_folder(folder, workers).items():
+            written[dataset] = write_partitions(table, root, dataset, roster)
+    if rounds:
+        table = read_rounds(rounds)
+        written['rounds'] = write_partitions(table, root, 'rounds', roster)
+        written['matches'] = write_partitions(read_matches(rounds, rounds=table), root, 'matches', roster)
+    if form:
+        written['form'] = write_partitions(read_player_form(form), root, 'form', roster)
+    if foracs:
+        written['foracs'] = write_partitions(read_acs(foracs), root, 'foracs', roster)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="store folder (created if missing)")
+    parser.add_argument("--roster", required=True, help="roster the CSVs belong to")
+    parser.add_argument("--rounds", help="round sheet CSV (also writes the match partitions)")
+    parser.add_argument("--form", help="form.csv")
+    parser.add_argument("--foracs", help="foracs.csv")
+    parser.add_argument("--folder", help="folder of per-day round sheet / form / ACS exports")
+    parser.add_argument("--workers", type=int, help="processes to load --folder with (default: one per CPU)")
+    args = parser.parse_args()
+    written = ingest(args.root, args.roster, args.rounds, args.form, args.foracs, args.folder, args.workers)
+    for dataset, paths in written.items():
+        print(f"{dataset}: {len(paths)} partition(s) rewritten")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Player-grain tables: form.csv / foracs.csv typing, per-agent stats and the VCT comparison."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable
+
+import pandas as pd
+
+from .dates import date_slice, sort_by_date
+from .schema import blank_to_na, compact, compact_number, widen
+
+FORM_TEXT_COLUMNS  = ['Column 1', 'Player', 'Agent', 'Date', 'Result']
+FORM_LABEL_COLUMNS = ['Column 1', 'Player', 'Agent', 'Result']
+ACS_LABEL_COLUMNS  = ['Map', 'Player', 'Agent', 'Result']
+
+AGENT_ROLES = {
+    'Jett':'Duelist','Raze':'Duelist','Reyna':'Duelist','Yoru':'Duelist','Phoenix':'Duelist','Iso':'Duelist','Waylay':'Duelist','Neon':'Duelist',
+    'Skye':'Initiator','KAY/O':'Initiator','Breach':'Initiator','Fade':'Initiator','Sova':'Initiator','Gekko':'Initiator','Tejo':'Initiator',
+    'Omen':'Controller','Brimstone':'Controller','Astra':'Controller','Viper':'Controller','Harbor':'Controller','Clove':'Controller',
+    'Killjoy':'Sentinel','Cypher':'Sentinel','Chamber':'Sentinel','Sage':'Sentinel','Deadlock':'Sentinel','Vyse':'Sentinel'
+}
+VCT_BENCHMARKS = {
+    'Duelist':    {'ACS':240,'KPR':0.90,'FBSR':0.55,'FKPR':0.18,'Atk_Entry':0.55},
+    'Initiator':  {'ACS':196,'KPR':0.90,'FD':2,'K+A per Round':1,'Assists':10.0},
+    'Controller': {'ACS':203,'KPR':0.90,'FD':2,'K+A per Round':1,'Multi_Kills':0.25},
+    'Sentinel':   {'ACS':200,'KPR':0.90,'FD':2,'Multi_Kills':0.25,'Anchor_Time':48.0},
+}
+# Value each radar axis is divided by, so every stat lands on a comparable 0–1ish scale.
+RADAR_NORM_BASE = {'ACS':300,'K/D Ratio':2.0,'FK':0.3,'K+A per Round':1.2,'KPR':1.2,'FBSR':1.0,'FKPR':0.3,'Atk_Entry':1.0,'FD':20.0,'Assists':20.0,'Multi_Kills':0.3,'Anchor_Time':80.0}
+
+# Per-agent aggregations, as (column, 'sum' | 'mean'): pandas named aggs, and the SQL store's SELECT list.
+COMPARE_STAT_AGGREGATES = dict(
+    Rounds=('Rounds','sum'), Kills=('Kills','sum'), Deaths=('Deaths','sum'),
+    Multi_Kills=('Multi_Kills','mean'), Assists=('Assists','mean'),
+    ACS=('ACS','mean'), FK=('FK','sum'), FBSR=('FBSR','mean'),
+    FKPR=('FKPR','mean'), KPR=('KPR','mean'), Atk_Entry=('Atk_Entry','mean'),
+    FD=('FD','mean'), Anchor_Time=('Anchor_Time','mean'),
+)
+
+
+def agent_stat_aggregates(columns) -> dict[str, tuple[str, str]]:
+    """player_agent_stats' aggregations for a form table with `columns` (FD Def falls back to FD)."""
+    return dict(
+        Rounds=('Rounds','sum'), Kills=('Kills','sum'), Deaths=('Deaths','sum'),
+        Assists=('Assists','sum'), ACS=('ACS','mean'), FK=('FK','sum'),
+        Plants=('Plants','sum'), FD=('FD','sum'), FD_Def=('FD Def','sum') if 'FD Def' in columns else ('FD','sum'),
+    )
+
+
+def normalize_player_form(raw: pd.DataFrame) -> pd.DataFrame:
+    """Type form.csv: compact numeric stats (``%`` suffixes stripped), parsed dates, categorical labels; sorted by date."""
+    raw.columns = raw.columns.str.strip()
+    for col in raw.columns.difference(FORM_TEXT_COLUMNS):
+        if not pd.api.types.is_numeric_dtype(raw[col]):
+            raw[col] = pd.to_numeric(raw[col].astype(str).str.replace('%', '', regex=False), errors='coerce')
+        raw[col] = compact_number(raw[col])
+    # The sheet mixes 05/22/2026 and 06-01-2026; a single inferred format turns half of it into NaT.
+    raw['Date'] = pd.to_datetime(raw['Date'], errors='coerce', format='mixed')
+    for col in FORM_LABEL_COLUMNS:
+        raw[col] = blank_to_na(raw[col])
+    return sort_by_date(compact(raw, labels=FORM_LABEL_COLUMNS))
+
+
+def normalize_acs(raw: pd.DataFrame) -> pd.DataFrame:
+    """Type foracs.csv: parsed dates, compact ACS and categorical labels; sorted by date."""
+    raw['Date'] = pd.to_datetime(raw['Date'], errors='coerce', format='mixed')  # same mixed formats as form.csv
+    for col in ACS_LABEL_COLUMNS:
+        raw[col] = blank_to_na(raw[col])
+    return sort_by_date(compact(raw, numbers=['ACS'], labels=ACS_LABEL_COLUMNS))
+
+
+def select_player_rows(form: pd.DataFrame, player: str, start_date: date, end_date: date,
+                       map_name: str = "All") -> pd.DataFrame:
+    """One player's form rows in a date range and map; rows without a date are always kept."""
+    rows = date_slice(form, start_date, end_date, keep_undated=True)
+    rows = rows[rows['Player'] == player]
+    if map_name != "All":
+        rows = rows[rows['Column 1'] == map_name]
+    return rows
+
+
+def player_agent_stats(rows: pd.DataFrame) -> pd.DataFrame:
+    """Per-agent totals (Player Stats tab) with K/D, K+A per round and FK-FD."""
+    agent_stats = widen(rows).groupby('Agent').agg(**agent_stat_aggregates(rows.columns)).reset_index()
+    agent_stats = _agent_ratios(agent_stats)
+    agent_stats['FK-FD']         = agent_stats['FK'] - agent_stats['FD']
+    return agent_stats
+
+
+def compare_agent_stats(rows: pd.DataFrame) -> pd.DataFrame:
+    """Per-agent stats on the benchmark axes (Compare tab), tagged with the agent's role."""
+    agent_stats = _agent_ratios(widen(rows).groupby('Agent').agg(**COMPARE_STAT_AGGREGATES).reset_index())
+    agent_stats['Role']          = agent_stats['Agent'].map(AGENT_ROLES)
+    return agent_stats
+
+
+def _agent_ratios(agent_stats):
+    """K/D and K+A per round on per-agent totals (NaN where the divisor is 0)."""
+    agent_stats['K/D Ratio']     = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    return agent_stats
+
+
+def role_averages(role_agents: pd.DataFrame, benchmark: dict[str, float]) -> dict[str, float]:
+    """The player's value for each benchmark stat over the agents of one role."""
+    player_avg = {}
+    for stat in benchmark:
+        if stat == 'FK':
+            player_avg[stat] = (role_agents['FK'].sum() / role_agents['Rounds'].sum()) if role_agents['Rounds'].sum() > 0 else 0
+        elif stat == 'K+A per Round':
+            player_avg[stat] = (role_agents['Kills'].sum() + role_agents['Assists'].sum()) / role_agents['Rounds'].sum()
+        elif stat == 'K/D Ratio':
+            player_avg[stat] = role_agents['Kills'].sum() / role_agents['Deaths'].replace(0, float('nan')).sum()
+        else:
+            val = role_agents[stat].mean() if stat in role_agents.columns else 0
+            player_avg[stat] = val if pd.notna(val) else 0
+    return player_avg
+
+
+def radar_values(player_avg: dict[str, float], benchmark: dict[str, float]) -> tuple[list[str], list[float], list[float]]:
+    """(axes, player values, benchmark values), each scaled by RADAR_NORM_BASE."""
+    categories       = list(benchmark.keys())
+    player_values    = [player_avg.get(s,0) / RADAR_NORM_BASE[s] for s in categories]
+    benchmark_values = [benchmark.get(s,0) / RADAR_NORM_BASE[s] for s in categories]
+    return categories, player_values, benchmark_values
+
+
+def select_acs_rows(acs: pd.DataFrame, player: str, agents: Iterable[str], maps: Iterable[str],
+                    start_date: date, end_date: date) -> pd.DataFrame:
+    """One player's foracs.csv rows for the given agents, maps and date range."""
+    rows = date_slice(acs, start_date, end_date)
+    return rows[
+        (rows['Player'] == player) &
+        (rows['Agent'].isin(agents)) &
+        (rows['Map'].isin(maps))
+    ]
+
+
+def agent_player_win_rates(acs: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Player × agent (win rate %, wins, games) pivots over every player and agent in `acs`."""
+    agg = acs.assign(_win=acs['Result'].str.strip().str.lower() == 'win').groupby(['Player', 'Agent']).agg(
+        games=('Result', 'count'), wins=('_win', 'sum')
+    ).reset_index()
+    agg['Win Rate %'] = (agg['wins'] / agg['games'] * 100).round(1)
+    pivot       = agg.pivot_table(index='Player', columns='Agent', values='Win Rate %', aggfunc='mean')
+    pivot_wins  = agg.pivot_table(index='Player', columns='Agent', values='wins',      aggfunc='sum')
+    pivot_games = agg.pivot_table(index='Player', columns='Agent', values='games',     aggfunc='sum')
+    if pivot.empty:
+        return pivot, pivot_wins, pivot_games
+    all_players = sorted(acs['Player'].dropna().unique())
+    all_agents  = sorted(acs['Agent'].dropna().unique())
+    return (pivot.reindex(index=all_players, columns=all_agents),
+            pivot_wins.reindex(index=all_players, columns=all_agents),
+            pivot_games.reindex(index=all_players, columns=all_agents))
@@ -0,0 +1,457 @@
+"""Batch reports without Streamlit: every tab's summaries for one date range and tier set, as HTML or PDF.
+
+    python -m scrim_analytics.report reports/                      # last 7 days, every tier
+    python -m scrim_analytics.report reports/ --start 2026-06-01 --end 2026-06-07 --tiers 1 2 \\
+        --each player map --format pdf --workers 8
+
+The tables are loaded once (through the disk cache) and cut to the period once.
+Every report in the run is built from that cut: the team report (Overview,
+Compositions, Insights, Pistol and each player's agent stats), and with --each one
+report per player (agent stats, role radars, ACS beeswarm) and one per map (the team
+report over that map's rows). The charts are the dashboard's own (see figures).
+A process pool builds, renders and writes the reports, each worker receiving the cut
+once. Charts are rendered to PNG; Plotly figures need kaleido and a Chrome for
+that. Without them, HTML reports embed the Plotly charts interactively instead, loading
+plotly.min.js once from the output folder, and PDF reports can't be made. As on the
+Stats tab, player rows without a date are always counted.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import html
+import io
+import os
+import re
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from multiprocessing.util import Finalize
+from typing import Iterable
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from .compositions import build_composition_index, composition_win_rates
+from .dates import date_slice
+from .figures import (
+    acs_beeswarm_figure, agent_win_rate_heatmap, conversion_pie_figure, map_tier_figure, map_win_rate_figure,
+    pistol_figure, post_plant_figure, radar_figure, side_win_rate_figure, site_figure, tempo_figure,
+    tempo_heatmap_figure,
+)
+from .folders import _pool_context, available_cpus, read_folder
+from .loaders import read_acs, read_matches, read_player_form, read_rounds
+from .matches import (
+    map_outcome_summary, map_tier_summary, pistol_summary, post_plant_summary, round_insights_summary,
+    second_round_conversions, select_matches,
+)
+from .players import agent_player_win_rates, compare_agent_stats, player_agent_stats
+from .rounds import select_rounds, site_post_plant_by_map, tempo_rounds, tempo_summary
+
+try:
+    import kaleido  # Plotly's static image export (drives a headless Chrome)
+except ImportError:
+    kaleido = None
+
+REPORT_DAYS = 7
+PDF_TABLE_ROWS = 25
+AGENT_STAT_COLUMNS = ['Agent', 'Rounds', 'Kills', 'Deaths', 'Assists', 'ACS', 'FK-FD', 'Plants', 'K/D Ratio', 'K+A per Round']
+INSIGHT_RATE_COLUMNS = {'Avg_Atk_WR': 'Avg_Atk_WR', 'Avg_Def_WR': 'Avg_Def_WR', 'Raw_Round_WR': 'Round WR'}
+
+
+# ── Tables ─────────────────────────────────────────────────────────────────────
+def load_tables(rounds_csv: str | None = None, form_csv: str | None = None, foracs_csv: str | None = None,
+                folder: str | None = None) -> dict[str, pd.DataFrame]:
+    """{'rounds', 'matches', 'form', 'foracs', 'compositions'} from the CSVs, or a folder of exports."""
+    if folder:
+        tables = read_folder(folder)
+    else:
+        rounds = read_rounds(rounds_csv)
+        tables = {'rounds': rounds, 'matches': read_matches(rounds_csv, rounds=rounds),
+                  'form': read_player_form(form_csv), 'foracs': read_acs(foracs_csv)}
+    tables['compositions'] = build_composition_index(tables['form'], tables['matches'])
+    return tables
+
+
+def select_period(tables: dict[str, pd.DataFrame], start_date: date, end_date: date,
+                  tiers: Iterable[int] | None = None) -> dict[str, pd.DataFrame]:
+    """Every table cut to the dates (inclusive) and opponent tiers (None: all of them).
+
+    Form rows have no tier and keep their undated rows; composition blocks are cut by
+    tier only when `tiers` is given, since blocks with no match in the round sheet have none.
+    """
+    all_tiers = sorted(tables['matches']['Tier'].unique())
+    comps = tables['compositions']
+    comps = comps[comps['Date'].between(pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1),
+                                        inclusive='left')]
+    if tiers is not None:
+        comps = comps[comps['Tier'].isin(tiers)]
+    tiers = all_tiers if tiers is None else list(tiers)
+    return {
+        'matches':      select_matches(tables['matches'], tiers, start_date, end_date),
+        'rounds':       select_rounds(tables['rounds'], tiers, start_date, end_date),
+        'form':         date_slice(tables['form'], start_date, end_date, keep_undated=True),
+        'foracs':       date_slice(tables['foracs'], start_date, end_date),
+        'compositions': comps,
+    }
+
+
+def map_period(period: dict[str, pd.DataFrame], map_name: str) -> dict[str, pd.DataFrame]:
+    """`period` narrowed to one map."""
+    return {
+        'matches':      period['matches'][period['matches']['Map'] == map_name],
+        'rounds':       period['rounds'][period['rounds']['Map'] == map_name],
+        'form':         period['form'][period['form']['Column 1'] == map_name],
+        'foracs':       period['foracs'][period['foracs']['Map'] == map_name],
+        'compositions': period['compositions'][period['compositions'].index == map_name],
+    }
+
+
+# ── Sections ───────────────────────────────────────────────────────────────────
+# A report is a list of (title, blocks); a block is a table, a Plotly or matplotlib
+# figure, or a line of text.
+def team_sections(period: dict[str, pd.DataFrame]) -> list[tuple[str, list]]:
+    """Overview, Compositions, Insights, Pistol and per-player agent stats over `period`."""
+    matches, rounds = period['matches'], period['rounds']
+    if matches.empty:
+        return [("Overview", ["No scrims for the selected tiers and dates."])]
+    sections = []
+
+    summary = map_outcome_summary(matches)
+    tier_summary = map_tier_summary(matches)
+    sections.append(("Overview", [summary.sort_values(by='Map'), map_win_rate_figure(summary),
+                                  map_tier_figure(tier_summary)]))
+
+    blocks = []
+    comps = period['compositions']
+    for map_name in sorted(comps.index.unique()):
+        blocks += [f"Top compositions on {map_name}",
+                   composition_win_rates(comps.loc[[map_name]])[['Composition', 'games', 'wins', 'draws', 'losses', 'Win Rate %']]]
+    pivot, pivot_wins, pivot_games = agent_player_win_rates(period['foracs'])
+    if not pivot.empty:
+        blocks.append(agent_win_rate_heatmap(pivot, pivot_wins, pivot_games))
+    sections.append(("Compositions", blocks or ["No composition data."]))
+
+    insights = round_insights_summary(matches)
+    blocks = [_percentages(insights, INSIGHT_RATE_COLUMNS)[['Map', 'Games', 'Wins', 'Draws', 'Losses',
+                                                             'Avg_Atk_WR', 'Avg_Def_WR', 'Round WR']],
+              side_win_rate_figure(insights), post_plant_figure(post_plant_summary(matches))]
+    for map_name, sites in site_post_plant_by_map(rounds).items():
+        if not sites.empty:
+            blocks.append(site_figure(sites, map_name))
+    attack = tempo_rounds(rounds)
+    if not attack.empty:
+        tempo = tempo_summary(attack)
+        blocks += [tempo_figure(tempo), tempo_heatmap_figure(tempo_summary(attack, by=('Map', 'Tempo'))),
+                   tempo.assign(Losses=tempo['Rounds'] - tempo['Wins'])[['Tempo', 'Rounds', 'Wins', 'Losses', 'Win Rate %']]]
+    sections.append(("Round Insights", blocks))
+
+    conversions = second_round_conversions(matches)
+    blocks = [pistol_figure(pistol_summary(matches))]
+    for map_name in sorted(conversions['Map'].dropna().unique()):
+        map_conversions = conversions[conversions['Map'] == map_name]
+        blocks += [fig for fig in (conversion_pie_figure(map_conversions, map_name, after_win=True),
+                                   conversion_pie_figure(map_conversions, map_name, after_win=False)) if fig]
+    sections.append(("Pistol", blocks))
+
+    blocks = []
+    for player, rows in _by_player(period['form']):
+        blocks += [player, player_agent_stats(rows).round(2)[AGENT_STAT_COLUMNS]]
+    sections.append(("Player Agent Stats", blocks or ["No player rows."]))
+    return sections
+
+
+def player_sections(period: dict[str, pd.DataFrame], player: str) -> list[tuple[str, list]]:
+    """One player's agent stats, a radar per role they played, and their ACS beeswarm."""
+    rows = period['form'][period['form']['Player'] == player]
+    if rows.empty:
+        return [("Agent Stats", [f"No rows for {player} in this period."])]
+    sections = [("Agent Stats", [player_agent_stats(rows).round(2)[AGENT_STAT_COLUMNS]])]
+    compare = compare_agent_stats(rows)
+    roles = sorted(compare['Role'].dropna().unique())
+    sections.append(("VCT Benchmark", [radar_figure(compare[compare['Role'] == role], role, player) for role in roles]
+                                      or ["No agents with a known role."]))
+    acs = period['foracs'][period['foracs']['Player'] == player]
+    if not acs.empty:
+        sections.append(("ACS", [acs_beeswarm_figure(acs, player)]))
+    return sections
+
+
+def _by_player(form):
+    return [(player, form[form['Player'] == player]) for player in sorted(form['Player'].dropna().unique())]
+
+
+def _percentages(summary, columns):
+    """`summary` with the fraction `columns` as '12.3%' strings (renamed per `columns`), '-' where missing."""
+    out = summary.copy()
+    for col, name in columns.items():
+        out[name] = summary[col].map(lambda x: f"{x*100:.1f}%" if pd.notnull(x) else "-")
+    return out
+
+
+# ── Images ─────────────────────────────────────────────────────────────────────
+def render_png(fig) -> bytes:
+    """PNG bytes of a Plotly (needs kaleido) or matplotlib figure; a matplotlib figure is closed afterwards."""
+    if isinstance(fig, go.Figure):
+        with warnings.catch_warnings():
+            # Under image_server plotly's kaleido options (map tile headers) are dropped; no chart here uses tiles.
+            warnings.filterwarnings("ignore", "The kopts argument is ignored", UserWarning)
+            return fig.to_image(format="png", width=1100)
+    import matplotlib.pyplot as plt
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100, facecolor=fig.get_facecolor(), bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+_IMAGE_PROBE = None  # (engine, why there is none), once image_engine has run in this process
+
+
+def image_engine() -> str | None:
+    """'kaleido' when Plotly figures can be rendered to PNG here, else None (image_problem says why).
+
+    Probed once per process with a small one-shot to_image: kaleido needs a Chrome it can
+    start, and without one a one-shot render fails within seconds while image_server's
+    renders wait forever.
+    """
+    global _IMAGE_PROBE
+    if _IMAGE_PROBE is None:
+        if kaleido is None:
+            _IMAGE_PROBE = (None, "kaleido is not installed (pip install -r requirements-optional.txt)")
+        else:
+            try:
+                go.Figure().to_image(format="png", width=10, height=10)
+                _IMAGE_PROBE = ("kaleido", "")
+            except Exception as e:  # Chrome not found (RuntimeError), or found but failing to start
+                reason = str(e.args[0] if e.args else e).strip().splitlines()[0]
+                _IMAGE_PROBE = (None, f"kaleido can't start Chrome: {reason} (run plotly_get_chrome or set BROWSER_PATH)")
+    return _IMAGE_PROBE[0]
+
+
+def image_problem() -> str:
+    """Why image_engine() is None ('' when it isn't)."""
+    image_engine()
+    return _IMAGE_PROBE[1]
+
+
+@contextmanager
+def image_server():
+    """Keep one kaleido browser open for the block's render_png calls (a lone to_image starts its own, ~10× slower)."""
+    if image_engine() is None:
+        yield
+        return
+    kaleido.start_sync_server(silence_warnings=True)
+    try:
+        yield
+    finally:
+        kaleido.stop_sync_server(silence_warnings=True)
+
+
+# ── Output ─────────────────────────────────────────────────────────────────────
+REPORT_CSS = """
+body { background:#000; color:#fff; font-family:Rajdhani,sans-serif; margin:2rem; }
+h1, h2, h3 { color:#E63946; }
+table { border-collapse:collapse; margin:0.5rem 0 1.5rem; }
+th { background:#1a1a1a; color:#E63946; }
+th, td { border:1px solid #333; padding:4px 10px; text-align:center; }
+img { max-width:100%; margin:0.5rem 0; }
+"""
+
+
+def write_html(path: str, title: str, subtitle: str, sections: list, images: dict[int, bytes]) -> None:
+    """One HTML report; figures whose id() is in `images` are embedded as PNGs, the rest as interactive Plotly."""
+    interactive = False
+    parts = [f"<h1>{html.escape(title)}</h1><p>{html.escape(subtitle)}</p>"]
+    for name, blocks in sections:
+        parts.append(f"<h2>{html.escape(name)}</h2>")
+        for block in blocks:
+            if isinstance(block, str):
+                parts.append(f"<h3>{html.escape(block)}</h3>")
+            elif isinstance(block, pd.DataFrame):
+                parts.append(block.to_html(index=False, na_rep="—", float_format=lambda x: f"{x:.2f}"))
+            elif id(block) in images:
+                parts.append(f'<img src="data:image/png;base64,{base64.b64encode(images[id(block)]).decode()}">')
+            else:
+                interactive = True
+                parts.append(block.to_html(full_html=False, include_plotlyjs=False))
+    script = '<script src="plotly.min.js"></script>' if interactive else ""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<!doctype html><html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+                f'<style>{REPORT_CSS}</style>{script}</head><body>{"".join(parts)}</body></html>')
+
+
+def write_pdf(path: str, title: str, subtitle: str, sections: list, images: dict[int, bytes]) -> None:
+    """One PDF report, a landscape page per table (PDF_TABLE_ROWS rows at a time) or figure."""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    def page(heading):
+        fig = plt.figure(figsize=(11.69, 8.27), facecolor='#000000')
+        fig.text(0.03, 0.96, heading, color='#E63946', fontsize=16, va='top')
+        return fig
+
+    with PdfPages(path) as pdf:
+        fig = page(title)
+        fig.text(0.03, 0.90, subtitle, color='#ffffff', fontsize=12, va='top')
+        pdf.savefig(fig); plt.close(fig)
+        for name, blocks in sections:
+            caption = ""
+            for block in blocks:
+                if isinstance(block, str):
+                    caption = block
+                    continue
+                heading = f"{name} — {caption}" if caption else name
+                if isinstance(block, pd.DataFrame):
+                    for start in range(0, max(len(block), 1), PDF_TABLE_ROWS):
+                        fig = page(heading)
+                        _pdf_table(fig, block.iloc[start:start + PDF_TABLE_ROWS])
+                        pdf.savefig(fig); plt.close(fig)
+                else:
+                    fig = page(heading)
+                    ax = fig.add_axes([0.03, 0.03, 0.94, 0.88])
+                    ax.imshow(plt.imread(io.BytesIO(images[id(block)]), format='png'))
+                    ax.axis('off')
+                    pdf.savefig(fig); plt.close(fig)
+                caption = ""
+
+
+def _pdf_table(fig, frame):
+    ax = fig.add_axes([0.03, 0.03, 0.94, 0.88])
+    ax.axis('off')
+    cells = frame.round(2).astype(object).where(frame.notna(), "—").astype(str).values.tolist()
+    table = ax.table(cellText=cells or [[""] * len(frame.columns)], colLabels=list(frame.columns), loc='upper center')
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    for (row, _), cell in table.get_celld().items():
+        cell.set_edgecolor('#333333')
+        cell.set_facecolor('#1a1a1a' if row == 0 else '#000000')
+        cell.get_text().set_color('#E63946' if row == 0 else '#ffffff')
+
+
+def slug(name: str) -> str:
+    """File-name-safe form of a player or map name."""
+    return re.sub(r"[^\w-]+", "_", str(name)).strip("_") or "unnamed"
+
+
+# ── Batch ──────────────────────────────────────────────────────────────────────
+def plan_reports(period: dict[str, pd.DataFrame], each: Iterable[str] = ()) -> list[tuple[str, str, str | None, str | None]]:
+    """[(file stem, title, map, player)]: the team report, plus one per map and/or player if `each` names them."""
+    plan = [("team", "Team report", None, None)]
+    if "map" in each:
+        plan += [(f"map-{slug(m)}", f"{m} report", m, None) for m in sorted(period['matches']['Map'].dropna().unique())]
+    if "player" in each:
+        plan += [(f"player-{slug(p)}", f"{p} report", None, p) for p in sorted(period['form']['Player'].dropna().unique())]
+    return plan
+
+
+def report_sections(period: dict[str, pd.DataFrame], map_name: str | None = None,
+                    player: str | None = None) -> list[tuple[str, list]]:
+    """The team report over `period`, or over one map's rows, or one player's report."""
+    if player is not None:
+        return player_sections(period, player)
+    return team_sections(map_period(period, map_name) if map_name is not None else period)
+
+
+def build_reports(tables: dict[str, pd.DataFrame], start_date: date, end_date: date,
+                  tiers: Iterable[int] | None = None, each: Iterable[str] = ()) -> dict[str, tuple[str, list]]:
+    """{file stem: (title, sections)} for every report of a run, built in this process."""
+    period = select_period(tables, start_date, end_date, tiers)
+    return {stem: (title, report_sections(period, map_name, player))
+            for stem, title, map_name, player in plan_reports(period, each)}
+
+
+def write_report(period: dict[str, pd.DataFrame], planned: tuple, out_dir: str, subtitle: str,
+                 fmt: str = "html") -> tuple[str, bool]:
+    """Build, render and write one plan_reports entry; returns (path, whether it needs plotly.min.js)."""
+    stem, title, map_name, player = planned
+    sections = report_sections(period, map_name, player)
+    figures = [block for _, blocks in sections for block in blocks if not isinstance(block, (str, pd.DataFrame))]
+    static = [fig for fig in figures if image_engine() or not isinstance(fig, go.Figure)]
+    images = {id(fig): render_png(fig) for fig in static}
+    path = os.path.join(out_dir, f"{stem}.{fmt}")
+    (write_pdf if fmt == "pdf" else write_html)(path, title, subtitle, sections, images)
+    return path, len(static) < len(figures)
+
+
+_PERIOD = None
+
+
+def _init_worker(period, engine):
+    global _PERIOD, _IMAGE_PROBE
+    _PERIOD = period
+    _IMAGE_PROBE = (engine, "")  # probed by the parent
+    if engine is not None:
+        # Pool workers leave through os._exit, past atexit; multiprocessing's own finalizers still run.
+        kaleido.start_sync_server(silence_warnings=True)
+        Finalize(None, kaleido.stop_sync_server, kwargs={'silence_warnings': True}, exitpriority=10)
+
+
+def _write_in_worker(planned, out_dir, subtitle, fmt):
+    return write_report(_PERIOD, planned, out_dir, subtitle, fmt)
+
+
+def write_reports(tables: dict[str, pd.DataFrame], start_date: date, end_date: date, out_dir: str,
+                  tiers: Iterable[int] | None = None, each: Iterable[str] = (), fmt: str = "html",
+                  workers: int | None = None) -> list[str]:
+    """Write every report of a run to `out_dir` as `fmt` ('html' / 'pdf'); returns the paths.
+
+    The period is selected once and sent to each of `workers` processes (default: one
+    per CPU; 1 writes in this process), which build, render and write whole reports.
+    Building the Plotly figures costs as much as rendering them; each process keeps
+    one kaleido browser open for its renders.
+    """
+    if fmt == "pdf" and image_engine() is None:
+        raise RuntimeError(f"PDF reports need the Plotly charts rendered, but {image_problem()}")
+    period = select_period(tables, start_date, end_date, tiers)
+    plan = plan_reports(period, each)
+    tier_text = "every tier" if tiers is None else "Tier " + ", ".join(map(str, tiers))
+    args = (out_dir, f"{start_date} → {end_date}, {tier_text}", fmt)
+    os.makedirs(out_dir, exist_ok=True)
+
+    workers = min(workers or available_cpus(), len(plan))
+    if workers <= 1:
+        with image_server():
+            written = [write_report(period, planned, *args) for planned in plan]
+    else:
+        with ProcessPoolExecutor(workers, mp_context=_pool_context(), initializer=_init_worker,
+                                 initargs=(period, image_engine())) as pool:
+            written = list(pool.map(_write_in_worker, plan, *([arg] * len(plan) for arg in args)))
+    if any(interactive for _, interactive in written):
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(out_dir, "plotly.min.js"), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+    return [path for path, _ in written]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", help="folder to write the reports to")
+    parser.add_argument("--rounds", default="Advanced_Data-_Sheet1.csv")
+    parser.add_argument("--form", default="form.csv")
+    parser.add_argument("--foracs", default="foracs.csv")
+    parser.add_argument("--folder", help="folder of per-day exports instead of the three CSVs")
+    parser.add_argument("--start", type=date.fromisoformat, help=f"first day (default: {REPORT_DAYS} days before --end)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day (default: the latest scrim)")
+    parser.add_argument("--tiers", type=int, nargs="+", help="opponent tiers (default: all)")
+    parser.add_argument("--each", nargs="+", choices=("player", "map"), default=(),
+                        help="also write a report per player and/or per map")
+    parser.add_argument("--format", choices=("html", "pdf"), default="html")
+    parser.add_argument("--workers", type=int, help="processes to write reports with (default: one per CPU)")
+    args = parser.parse_args()
+    if image_engine() is None:
+        if args.format == "pdf":
+            parser.error(f"--format pdf needs the Plotly charts rendered, but {image_problem()}")
+        if kaleido is not None:
+            print(f"Plotly charts stay interactive: {image_problem()}", file=sys.stderr)
+
+    tables = load_tables(args.rounds, args.form, args.foracs, args.folder)
+    end = args.end or tables['matches']['Date'].max().date()
+    start = args.start or end - timedelta(days=REPORT_DAYS - 1)
+    for path in write_reports(tables, start, end, args.out, args.tiers, args.each, args.format, args.workers):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
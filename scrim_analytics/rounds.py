@@ -0,0 +1,148 @@
+"""Round-grain table: parsing the round sheet and the analyses that need round detail."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .dates import date_slice, sort_by_date
+from .schema import blank_to_na, compact
+
+ROUND_TEXT_COLUMNS   = ['Result', 'Side', 'Site', 'Plant XvY', 'Pistol', 'Team', 'Map', 'Time to engagement', 'Time at Plant']
+ROUND_LABEL_COLUMNS  = ['Map', 'Team', 'Side', 'Site', 'Result', 'Pistol', 'Plant XvY', 'Time to engagement', 'Time at Plant']
+ROUND_NUMBER_COLUMNS = ['Round', 'Tier']
+ROUND_FLOAT_COLUMNS  = ['Engage Secs', 'Plant Secs']
+TEMPO_BINS   = [0, 40, 60, 75, 100]
+TEMPO_LABELS = ['Very Early (≤0:40)', 'Early (0:41–1:00)', 'Mid (1:01–1:15)', 'Late (1:16–1:40)']
+
+
+def clock_to_seconds(times: pd.Series) -> pd.Series:
+    """Vectorised 'M:SS' → seconds; anything unparseable becomes NaN."""
+    parts = times.astype(str).str.extract(r'^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::.*)?$')
+    return pd.to_numeric(parts[0]) * 60 + pd.to_numeric(parts[1])
+
+
+def normalize_rounds(raw: pd.DataFrame) -> pd.DataFrame:
+    """Clean a raw round sheet into the typed table every view derives from (sorted by date)."""
+    raw.columns = raw.columns.str.strip()
+    for col in ROUND_TEXT_COLUMNS:
+        if col in raw.columns:
+            raw[col] = blank_to_na(raw[col])
+    if 'Date' in raw.columns:
+        raw['Date'] = pd.to_datetime(raw['Date'], errors='coerce')
+    # Mark plant rounds
+    raw['Planted'] = raw['Time at Plant'].notna()
+    raw['Engage Secs'] = clock_to_seconds(raw['Time to engagement'])
+    raw['Plant Secs']  = clock_to_seconds(raw['Time at Plant'])
+    raw['Tempo'] = tempo_buckets(raw['Engage Secs'])
+    compact(raw, numbers=ROUND_NUMBER_COLUMNS, floats=ROUND_FLOAT_COLUMNS, labels=ROUND_LABEL_COLUMNS)
+    return sort_by_date(raw) if 'Date' in raw.columns else raw
+
+
+def append_rounds(rounds: pd.DataFrame, new_rounds: pd.DataFrame) -> pd.DataFrame:
+    """Normalized `new_rounds` appended to `rounds`, typed and ordered as normalize_rounds would the whole sheet."""
+    if new_rounds.empty:
+        return rounds
+    if list(new_rounds.columns) != list(rounds.columns):
+        raise ValueError("appended rows don't have the round table's columns")
+    labels = [c for c in ROUND_LABEL_COLUMNS if c in rounds.columns]
+    # A few rows infer their own dtypes; use the table's unless they need a wider one
+    # (a blank Tier where the sheet had none, a Round past int8), which means a rebuild.
+    for col, dtype in rounds.dtypes.items():
+        if col not in labels and isinstance(dtype, np.dtype) and isinstance(new_rounds[col].dtype, np.dtype) \
+                and np.result_type(dtype, new_rounds[col].dtype) != dtype:
+            raise ValueError(f"appended rows need a wider {col} column")
+    new_rounds = new_rounds.astype({c: t for c, t in rounds.dtypes.items() if c not in labels})
+    new_rounds = new_rounds.set_axis(new_rounds.index + len(rounds))  # source row numbers continue
+    combined = pd.concat([rounds.drop(columns=labels), new_rounds.drop(columns=labels)])
+    for col in labels:
+        combined[col] = pd.Series(union_categoricals([rounds[col], new_rounds[col]], sort_categories=True),
+                                  index=combined.index)
+    return sort_by_date(combined[rounds.columns])
+
+
+def select_rounds(rounds: pd.DataFrame, tiers: Iterable[int], start_date: date | None = None,
+                  end_date: date | None = None, map_name: str = "All") -> pd.DataFrame:
+    """Round-level counterpart of select_matches (untiered rounds count as Tier 1)."""
+    out = date_slice(rounds, start_date, end_date) if start_date and end_date else rounds
+    if 'Tier' in out.columns:
+        out = out[out['Tier'].fillna(1).astype(int).isin(tiers)]
+    if map_name != "All":
+        out = out[out['Map'] == map_name]
+    return out
+
+
+def _planted_site_counts(rounds, by):
+    """(rounds, wins) of planted rounds per `by` + (Site, Side), from one grouped pass."""
+    planted = rounds[rounds['Planted'] == True]
+    won = planted['Result'].str.lower() == 'win'
+    return won.groupby([planted[c] for c in [*by, 'Site', 'Side']], observed=True).agg(['size', 'sum'])
+
+
+def _site_rows(counts):
+    """Site summary frame from a (Site, Side)-indexed table of planted round counts."""
+    counts = counts.to_dict('index')
+    rows = []
+    for site in ['A', 'B', 'C']:
+        atk = counts.get((site, 'Attack'),  {'size': 0, 'sum': 0})
+        dfn = counts.get((site, 'Defence'), {'size': 0, 'sum': 0})
+
+        atk_n = atk['size']
+        def_n = dfn['size']
+        atk_wr = round(atk['sum'] / atk_n * 100, 1) if atk_n > 0 else None
+        def_wr = round(dfn['sum'] / def_n * 100, 1) if def_n > 0 else None
+
+        if atk_n > 0 or def_n > 0:
+            rows.append({
+                'Site': f'Site {site}',
+                'Post Plant (Atk)': atk_wr,
+                'Retake (Def)': def_wr,
+                'Atk Plants': atk_n,
+                'Def Plants': def_n,
+            })
+    return pd.DataFrame(rows)
+
+
+def site_post_plant_summary(rounds: pd.DataFrame) -> pd.DataFrame:
+    """Post-plant (Atk) and retake (Def) win rate per site over planted rounds."""
+    return _site_rows(_planted_site_counts(rounds, []))
+
+
+def tempo_buckets(engage_secs: pd.Series) -> pd.Series:
+    """Engagement times bucketed into TEMPO_LABELS (NaN outside TEMPO_BINS)."""
+    return pd.cut(engage_secs, bins=TEMPO_BINS, labels=TEMPO_LABELS)
+
+
+def tempo_rounds(rounds: pd.DataFrame) -> pd.DataFrame:
+    """Attack rounds with a parsed engagement time; Tempo comes from normalize_rounds."""
+    tempo_rd = rounds[(rounds['Side'] == 'Attack') & rounds['Engage Secs'].notna()]
+    if 'Tempo' not in tempo_rd.columns:
+        tempo_rd = tempo_rd.assign(Tempo=tempo_buckets(tempo_rd['Engage Secs']))
+    return tempo_rd
+
+
+def tempo_summary(tempo_rd: pd.DataFrame, by: Sequence[str] = ('Tempo',)) -> pd.DataFrame:
+    """Rounds, wins and win rate per tempo bucket (optionally split by more columns)."""
+    summary = tempo_rd.assign(_win=tempo_rd['Result'].str.lower() == 'win').groupby(list(by), observed=True).agg(
+        Rounds=('Result', 'count'), Wins=('_win', 'sum')
+    ).reset_index()
+    summary['Win Rate %'] = (summary['Wins'] / summary['Rounds'] * 100).round(1)
+    return summary
+
+
+def site_post_plant_by_map(rounds: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """{map: site_post_plant_summary} for every map present in `rounds`."""
+    return _sites_by_map(_planted_site_counts(rounds, ['Map']), rounds['Map'])
+
+
+def _sites_by_map(counts, maps):
+    """Split a (Map, Site, Side)-indexed count table into one site summary per map in `maps`."""
+    empty = counts.iloc[:0].droplevel('Map')
+    present = set(counts.index.get_level_values('Map'))
+    return {
+        m: _site_rows(counts.xs(m, level='Map') if m in present else empty)
+        for m in sorted(maps.dropna().unique())
+    }
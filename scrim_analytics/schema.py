@@ -0,0 +1,105 @@
+"""Compact column types applied at load time, and a per-table memory report.
+
+Repeated text (maps, teams, agents, results, clock strings) is stored as categoricals,
+counts as the smallest integer type that holds them, and fractional stats as
+float32. Missing values stay NaN rather than sentinel strings, so ``isna`` /
+``dropna`` mean what they say. Tables are shared by every session (and copied into
+each session's filtered views), so this is most of the dashboard's resident memory.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+def compact_number(s: pd.Series) -> pd.Series:
+    """Smallest integer dtype when every value is a whole number, else float32."""
+    s = pd.to_numeric(s, errors='coerce')
+    if s.notna().all() and np.array_equal(s, np.round(s)):
+        return pd.to_numeric(s, downcast='integer')
+    return s.astype('float32')
+
+
+def compact(df: pd.DataFrame, numbers: Iterable[str] = (), floats: Iterable[str] = (),
+            labels: Iterable[str] = ()) -> pd.DataFrame:
+    """Shrink the named columns of `df` in place (absent ones are skipped) and return it.
+
+    `numbers` go through compact_number, `floats` become float32 whatever their values,
+    and `labels` become categoricals.
+    """
+    for col in numbers:
+        if col in df.columns:
+            df[col] = compact_number(df[col])
+    for col in floats:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    for col in labels:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def concat_compact(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    """Compact tables with the same columns stacked into one, typed as compacting the whole would type it.
+
+    Categoricals are unioned (sorted categories) instead of decoding to object, and a
+    number column whose parts came out as different dtypes is compacted again (an
+    int8 part next to a float32 one makes float32, not whatever concat picks).
+    """
+    if len(parts) == 1:
+        return parts[0]
+    first = parts[0]
+    # Categoricals with the same categories (Tempo's fixed bins) concatenate as they are.
+    labels = [col for col, t in first.dtypes.items()
+              if isinstance(t, pd.CategoricalDtype) and any(part[col].dtype != t for part in parts)]
+    out = pd.concat([part.drop(columns=labels) for part in parts])
+    for col in out.columns:
+        dtypes = {part[col].dtype for part in parts}
+        if len(dtypes) > 1 and all(pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in dtypes):
+            out[col] = compact_number(out[col])
+    for col in labels:
+        out[col] = pd.Series(_union_labels([part[col] for part in parts]), index=out.index)
+    return out[first.columns]
+
+
+def _union_labels(columns):
+    """union_categoricals over `columns`; an all-blank part's empty categories take the others' dtype."""
+    text = next((c.cat.categories.dtype for c in columns if len(c.cat.categories)), None)
+    if text is not None:
+        columns = [c if len(c.cat.categories) else c.cat.set_categories(pd.Index([], dtype=text)) for c in columns]
+    return union_categoricals(columns, sort_categories=True)
+
+
+def widen(df: pd.DataFrame) -> pd.DataFrame:
+    """int64 / float64 copy of `df`'s numeric columns, to aggregate without int8 overflow or float32 drift.
+
+    Grouped sums come back in the column's own dtype when they fit, so arithmetic on
+    them (Kills + Assists) would still wrap; widen the (filtered) rows first.
+    """
+    wide = {col: 'int64' if pd.api.types.is_integer_dtype(t) else 'float64'
+            for col, t in df.dtypes.items()
+            if isinstance(t, np.dtype) and (pd.api.types.is_integer_dtype(t) or t == np.float32)}
+    return df.astype(wide) if wide else df
+
+
+def blank_to_na(s: pd.Series) -> pd.Series:
+    """Stripped text with empty and literal 'nan' cells as NaN."""
+    return s.astype(str).str.strip().replace(['', 'nan'], np.nan)
+
+
+def memory_report(tables: dict[str, pd.DataFrame], before: dict[str, pd.DataFrame] | None = None) -> pd.DataFrame:
+    """Rows and deep memory (KiB) per table; with `before`, that table's size and the ratio too."""
+    def kib(df):
+        return df.memory_usage(deep=True).sum() / 1024
+
+    rows = []
+    for name, df in tables.items():
+        row = {'Table': name, 'Rows': len(df), 'KiB': round(kib(df), 1)}
+        if before is not None and name in before:
+            row['Before KiB'] = round(kib(before[name]), 1)
+            row['Ratio'] = round(row['KiB'] / row['Before KiB'], 2) if row['Before KiB'] else None
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,334 @@
+"""Embedded SQL copy of the scrim tables, with the tab summaries as parameterised queries.
+
+    python -m scrim_analytics.sqlstore scrims.db --rounds Advanced_Data-_Sheet1.csv --form form.csv
+
+build_store loads the CSVs with the usual read_* loaders and writes the round, match
+and player form tables, the round / match cubes and the composition index into one
+database file: DuckDB when it is installed (columnar scans), else the standard
+library's SQLite. Both get indexes on the filter columns (tier, date, player, map).
+SqlStore filters and groups inside the engine, so only the grouped rows come back
+to pandas; counts are summed from the cube tables and finished by the cube
+roll-ups, and every summary matches its pandas counterpart.
+
+Dates are stored as ISO text, which compares and sorts like the timestamps, and
+labels as text. Round Tier is stored with the untiered → Tier 1 default applied.
+The file records the CSVs' versions; open_store rebuilds it when one has changed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from .cache import source_version
+from .compositions import _composition_rates, build_composition_index
+from .cube import build_match_cube, build_round_cube
+from .dates import sort_by_date
+from .loaders import read_matches, read_player_form, read_rounds
+from .matches import _pistol_rates, _round_wr_columns
+from .players import AGENT_ROLES, COMPARE_STAT_AGGREGATES, _agent_ratios, agent_stat_aggregates
+from .rounds import TEMPO_LABELS
+
+try:
+    import duckdb
+    SQL_ENGINE = "duckdb"
+except ImportError:
+    duckdb = None
+    SQL_ENGINE = "sqlite"
+
+SQL_STORE_VERSION = 2  # bump when a table's layout or contents change; open_store then rebuilds
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+ROW = "_row"  # position in the loaded (date-sorted) table, to return rows in that order
+INDEXES = {
+    'rounds':       [('Tier', 'Date'), ('Map',)],
+    'matches':      [('Tier', 'Date'), ('Map',)],
+    'form':         [('Player', 'Date')],
+    'round_cube':   [('Tier', 'Date')],
+    'match_cube':   [('Tier', 'Date')],
+    'compositions': [('Map',)],
+}
+ENGINE_ERRORS = (OSError, sqlite3.Error) + ((duckdb.Error,) if duckdb else ())
+
+
+def _connect(path, engine, read_only=False):
+    if engine == "duckdb":
+        return duckdb.connect(path, read_only=read_only)
+    if read_only:
+        return sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    return sqlite3.connect(path)
+
+
+def _sql_frame(table):
+    """`table` with ISO text dates, plain text labels, float64 stats and a ROW column."""
+    out = {}
+    for col, s in table.items():
+        if pd.api.types.is_datetime64_any_dtype(s):
+            s = s.dt.strftime(DATE_FORMAT)
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)
+        elif s.dtype == 'float32':
+            s = s.astype('float64')
+        out[col] = s
+    return pd.DataFrame(out).assign(**{ROW: range(len(table))})
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _create_table(con, engine, name, frame):
+    if engine == "duckdb":
+        con.register("_frame", frame)
+        con.execute(f"CREATE TABLE {_quote(name)} AS SELECT * FROM _frame")
+        con.unregister("_frame")
+    else:
+        frame.to_sql(name, con, index=False)
+    for cols in INDEXES.get(name, ()):
+        con.execute(f"CREATE INDEX {_quote('_'.join((name,) + cols))} ON {_quote(name)} "
+                    f"({', '.join(_quote(c) for c in cols)})")
+
+
+def _stamp(rounds_csv, form_csv, engine):
+    return json.dumps({"version": SQL_STORE_VERSION, "engine": engine,
+                       "rounds": source_version(rounds_csv), "form": source_version(form_csv)})
+
+
+def build_store(path: str, rounds_csv: str, form_csv: str, engine: str = SQL_ENGINE) -> None:
+    """Write the round, match, form, cube and composition tables from the CSVs to a new database at `path`."""
+    rounds = read_rounds(rounds_csv)
+    matches = read_matches(rounds_csv, rounds=rounds)
+    form = read_player_form(form_csv)
+    if 'Tier' in rounds.columns:
+        rounds = rounds.assign(Tier=rounds['Tier'].fillna(1).astype(int))
+    tables = {'rounds': rounds, 'matches': matches, 'form': form,
+              'round_cube': build_round_cube(rounds), 'match_cube': build_match_cube(matches),
+              'compositions': build_composition_index(form, matches).reset_index()}
+    tmp = f"{path}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = _connect(tmp, engine)
+    try:
+        for name, table in tables.items():
+            _create_table(con, engine, name, _sql_frame(table))
+        con.execute("CREATE TABLE meta (key TEXT, value TEXT)")
+        con.execute("INSERT INTO meta VALUES (?, ?)", ["sources", _stamp(rounds_csv, form_csv, engine)])
+        if engine == "sqlite":
+            con.execute("ANALYZE")
+            con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, path)
+
+
+def open_store(path: str, rounds_csv: str, form_csv: str, engine: str = SQL_ENGINE) -> SqlStore:
+    """The store at `path`, built first when it is missing, stale or from another engine / store version."""
+    try:
+        store = SqlStore(path, engine)
+        if store.query("SELECT value FROM meta WHERE key = 'sources'")['value'].tolist() == \
+                [_stamp(rounds_csv, form_csv, engine)]:
+            return store
+        store.close()
+    except ENGINE_ERRORS:
+        pass
+    build_store(path, rounds_csv, form_csv, engine)
+    return SqlStore(path, engine)
+
+
+def _count(condition):
+    return f"CAST(SUM(CASE WHEN {condition} THEN 1 ELSE 0 END) AS BIGINT)"
+
+
+def _outcome_counts(col, outcomes=(('Wins', 'win'), ('Draws', 'draw'), ('Losses', 'loss'))):
+    return ", ".join(f"{_count(f'lower({_quote(col)}) = {outcome!r}')} AS {_quote(name)}" for name, outcome in outcomes)
+
+
+def _sums(*cols):
+    return ", ".join(f"CAST(SUM({_quote(c)}) AS BIGINT) AS {_quote(c)}" for c in cols)
+
+
+def _aggregates(spec):
+    """SELECT list for pandas-style named aggregations {name: (column, 'sum' | 'mean')}."""
+    return ", ".join(f"{'SUM' if how == 'sum' else 'AVG'}({_quote(col)}) AS {_quote(name)}"
+                     for name, (col, how) in spec.items())
+
+
+def _where(tiers=None, start_date=None, end_date=None, map_name="All", map_col='Map', keep_undated=False,
+           player=None, present=()):
+    """WHERE clause and parameters for the select_* filters; `present` columns must be non-null."""
+    clauses, params = [], []
+    if tiers is not None:
+        tiers = [int(t) for t in tiers]
+        clauses.append(f'"Tier" IN ({", ".join("?" * len(tiers))})' if tiers else "1 = 0")
+        params += tiers
+    if start_date and end_date:
+        dated = '("Date" >= ? AND "Date" < ?)'
+        clauses.append(f'({dated} OR "Date" IS NULL)' if keep_undated else dated)
+        params += [pd.Timestamp(start_date).strftime(DATE_FORMAT),
+                   (pd.Timestamp(end_date) + pd.Timedelta(days=1)).strftime(DATE_FORMAT)]
+    if player is not None:
+        clauses.append('"Player" = ?')
+        params.append(player)
+    if map_name != "All":
+        clauses.append(f"{_quote(map_col)} = ?")
+        params.append(map_name)
+    clauses += [f"{_quote(c)} IS NOT NULL" for c in present]
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class SqlStore:
+    """Read-only connection to a build_store database; safe to share between sessions (queries are serialised)."""
+
+    def __init__(self, path: str, engine: str = SQL_ENGINE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path, self.engine = path, engine
+        self._con = _connect(path, engine, read_only=True)
+        self._lock = threading.Lock()
+        self._schemas = {}
+
+    def close(self):
+        self._con.close()
+
+    def query(self, sql: str, params: Iterable = ()) -> pd.DataFrame:
+        with self._lock:
+            if self.engine == "duckdb":
+                return self._con.execute(sql, list(params)).df()
+            frame = pd.read_sql_query(sql, self._con, params=list(params))
+        # SQLite hands back a column with no values (an all-NULL AVG, say) as None objects.
+        empty = [c for c in frame.columns if frame[c].dtype == object and frame[c].isna().all()]
+        return frame.astype(dict.fromkeys(empty, 'float64')) if empty else frame
+
+    def schema(self, table: str) -> dict[str, str]:
+        """{column: declared SQL type} of `table`, without the ROW column."""
+        if table not in self._schemas:
+            if self.engine == "duckdb":
+                info = self.query(f"DESCRIBE {_quote(table)}")[['column_name', 'column_type']]
+            else:
+                info = self.query(f"PRAGMA table_info({_quote(table)})")[['name', 'type']]
+            self._schemas[table] = {name: kind for name, kind in info.itertuples(index=False) if name != ROW}
+        return self._schemas[table]
+
+    def _rows(self, table, where, params):
+        rows = self.query(f"SELECT * FROM {_quote(table)} {where} ORDER BY {ROW}", params).drop(columns=ROW)
+        rows['Date'] = pd.to_datetime(rows['Date'], format=DATE_FORMAT)
+        return rows
+
+    # ── Rows ───────────────────────────────────────────────────────────────────
+    def matches(self, tiers: Iterable[int], start_date: date | None = None, end_date: date | None = None,
+                map_name: str = "All") -> pd.DataFrame:
+        """select_matches' rows (text labels rather than categoricals), date-sorted."""
+        return sort_by_date(self._rows('matches', *_where(tiers, start_date, end_date, map_name)), ignore_index=True)
+
+    def compositions(self) -> pd.DataFrame:
+        """The composition index (see build_composition_index), indexed by Map."""
+        return self._rows('compositions', "", ()).set_index('Map')
+
+    # ── Cells for the cube roll-ups ────────────────────────────────────────────
+    def match_cells(self, tiers: Iterable[int], start_date: date | None = None, end_date: date | None = None,
+                    map_name: str = "All") -> pd.DataFrame:
+        """Games / wins / draws / losses per (Map, Tier) for cube_map_outcome_summary / cube_map_tier_summary."""
+        where, params = _where(tiers, start_date, end_date, map_name)
+        return self.query(f'SELECT "Map", "Tier", {_sums("Games", "Wins", "Draws", "Losses")} '
+                          f'FROM match_cube {where} GROUP BY "Map", "Tier"', params)
+
+    def round_cells(self, tiers: Iterable[int], start_date: date | None = None, end_date: date | None = None,
+                    map_name: str = "All") -> pd.DataFrame:
+        """Rows / rounds / wins per (Map, Side, Site, Planted, Tempo) for cube_site_by_map / cube_tempo_summary."""
+        where, params = _where(tiers, start_date, end_date, map_name)
+        cells = self.query(f'SELECT "Map", "Side", "Site", "Planted", "Tempo", {_sums("Rows", "Rounds", "Wins")} '
+                           f'FROM round_cube {where} GROUP BY "Map", "Side", "Site", "Planted", "Tempo"', params)
+        cells['Tempo'] = pd.Categorical(cells['Tempo'], categories=TEMPO_LABELS, ordered=True)
+        return cells
+
+    # ── Summaries ──────────────────────────────────────────────────────────────
+    def tier_games(self) -> pd.DataFrame:
+        """Same frame as tier_games(matches)."""
+        return self.query(f'SELECT "Tier", COUNT(*) AS "Games", {_outcome_counts("Outcome", [("Wins", "win")])} '
+                          f'FROM matches GROUP BY "Tier" ORDER BY "Tier"')
+
+    def round_insights_summary(self, tiers: Iterable[int], start_date: date | None = None,
+                               end_date: date | None = None, map_name: str = "All") -> pd.DataFrame:
+        """Same frame as round_insights_summary(select_matches(...))."""
+        where, params = _where(tiers, start_date, end_date, map_name, present=('Map',))
+        return _round_wr_columns(self.query(
+            f'SELECT "Map", COUNT("Outcome") AS "Games", {_outcome_counts("Outcome")}, '
+            f'AVG("Atk WR Derived") AS "Avg_Atk_WR", AVG("Def WR Derived") AS "Avg_Def_WR", '
+            f'AVG("Atk_PP_Success") AS "Atk_PP_Success", AVG("Def_PP_Success") AS "Def_PP_Success" '
+            f'FROM matches {where} GROUP BY "Map" ORDER BY "Map"', params))
+
+    def post_plant_summary(self, tiers: Iterable[int], start_date: date | None = None,
+                           end_date: date | None = None, map_name: str = "All") -> pd.DataFrame:
+        """Same frame as post_plant_summary(select_matches(...))."""
+        where, params = _where(tiers, start_date, end_date, map_name, present=('Map',))
+        return self.query(f'SELECT "Map", AVG("Atk_PP_Success") AS "Atk_PP_Success", '
+                          f'AVG("Def_PP_Success") AS "Def_PP_Success" '
+                          f'FROM matches {where} GROUP BY "Map" ORDER BY "Map"', params)
+
+    def pistol_summary(self, tiers: Iterable[int], start_date: date | None = None,
+                       end_date: date | None = None) -> pd.DataFrame:
+        """Same frame as pistol_summary(select_matches(...))."""
+        where, params = _where(tiers, start_date, end_date, present=('Map',))
+        return _pistol_rates(self.query(
+            f'SELECT "Map", CAST(SUM("Total Pistols Won") AS BIGINT) AS "Total_Pistols_Won", '
+            f'COUNT("Map") AS "Total_Pistols_Played" FROM matches {where} GROUP BY "Map" ORDER BY "Map"', params))
+
+    def second_round_conversions(self, tiers: Iterable[int], start_date: date | None = None,
+                                 end_date: date | None = None) -> pd.DataFrame:
+        """Same (Map, Conversion) rows as second_round_conversions(select_matches(...))."""
+        where, params = _where(tiers, start_date, end_date)
+        return pd.concat([
+            self.query(f'SELECT "Map", {_quote(col)} AS "Conversion" FROM matches {where} ORDER BY {ROW}', params)
+            for col in ('Atk 2nd', 'Def 2nd')
+        ])
+
+    def player_agent_stats(self, player: str, start_date: date, end_date: date,
+                           map_name: str = "All") -> pd.DataFrame:
+        """Same frame as player_agent_stats(select_player_rows(...))."""
+        agent_stats = self._agent_totals(agent_stat_aggregates(self.schema('form')),
+                                         player, start_date, end_date, map_name)
+        agent_stats['FK-FD'] = agent_stats['FK'] - agent_stats['FD']
+        return agent_stats
+
+    def compare_agent_stats(self, player: str, start_date: date, end_date: date,
+                            map_name: str = "All") -> pd.DataFrame:
+        """Same frame as compare_agent_stats(select_player_rows(...))."""
+        return self._agent_totals(COMPARE_STAT_AGGREGATES, player, start_date, end_date, map_name) \
+            .assign(Role=lambda s: s['Agent'].map(AGENT_ROLES))
+
+    def _agent_totals(self, spec, player, start_date, end_date, map_name):
+        where, params = _where(None, start_date, end_date, map_name, map_col='Column 1', keep_undated=True,
+                               player=player, present=('Agent',))
+        return _agent_ratios(self.query(f'SELECT "Agent", {_aggregates(spec)} FROM form {where} '
+                                        f'GROUP BY "Agent" ORDER BY "Agent"', params))
+
+    def composition_win_rates(self, map_name: str, tiers: Iterable[int] | None = None, top: int = 15) -> pd.DataFrame:
+        """Same frame as composition_win_rates(comps.loc[[map_name]]), optionally restricted to `tiers`."""
+        where, params = _where(tiers, map_name=map_name)
+        return _composition_rates(self.query(
+            f'SELECT "Composition", COUNT(*) AS "games", SUM("Win") AS "wins", SUM("Draw") AS "draws", '
+            f'SUM("Loss") AS "losses" FROM compositions {where} GROUP BY "Composition" ORDER BY "Composition"',
+            params), top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="database file to (re)build")
+    parser.add_argument("--rounds", required=True, help="round sheet CSV")
+    parser.add_argument("--form", required=True, help="form.csv")
+    parser.add_argument("--engine", choices=("duckdb", "sqlite"), default=SQL_ENGINE)
+    args = parser.parse_args()
+    build_store(args.db, args.rounds, args.form, args.engine)
+    store = SqlStore(args.db, args.engine)
+    for table in INDEXES:
+        print(f"{table}: {store.query(f'SELECT COUNT(*) AS n FROM {_quote(table)}')['n'][0]:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Read the round sheet in bounded chunks instead of all at once.
+
+A whole-sheet pd.read_csv holds every cell as text, and the cleanup in
+normalize_rounds makes several more full-column string copies before the table
+shrinks to its compact dtypes. For a multi-season export that peak is many times
+the final table. Here the sheet is read CHUNK_ROWS rows at a time and each chunk is
+normalised on its own, so the text only ever exists for one chunk:
+
+- read_round_chunks yields typed chunks. Dates are parsed with the format pandas
+  guesses from the sheet's first date, so every chunk parses like the whole sheet.
+- stream_rounds stacks them into the round table.
+- stream_matches aggregates each match once all of its rounds have streamed past.
+  It never holds the round table, only the rounds of the match still in progress
+  at a chunk boundary.
+- match_rounds picks just the rows of a few matches out of the sheet.
+
+Both give exactly what read_csv + normalize_rounds + aggregate_matches give the
+whole sheet.
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from .dates import sort_by_date
+from .matches import MATCH_KEY, _lookup, aggregate_matches
+from .rounds import normalize_rounds
+from .schema import concat_compact
+
+CHUNK_ROWS = 50_000
+
+
+def read_round_chunks(path: str, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """normalize_rounds of each `chunksize`-row block of the round sheet, in file order (index: source row)."""
+    date_format, guessed = None, False
+    for raw in pd.read_csv(path, chunksize=chunksize):
+        raw.columns = raw.columns.str.strip()
+        if 'Date' in raw.columns:
+            if not guessed:
+                dated = raw['Date'].dropna()
+                if len(dated):
+                    date_format, guessed = guess_datetime_format(str(dated.iloc[0])), True
+            raw['Date'] = pd.to_datetime(raw['Date'], errors='coerce', format=date_format)
+        yield normalize_rounds(raw)
+
+
+def stream_rounds(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """The normalized round table, built one chunk at a time."""
+    table = concat_compact(list(read_round_chunks(path, chunksize)))
+    return sort_by_date(table) if 'Date' in table.columns else table
+
+
+def stream_matches(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """aggregate_matches over the whole round sheet, aggregating each chunk's finished matches as it streams.
+
+    The match of a chunk's last row may go on in the next chunk, so its rounds are
+    carried over. A match whose rounds come back after other matches (rows pasted
+    out of order) is aggregated again from a second pass over just its rows.
+    """
+    parts, carry = [], None
+    for chunk in read_round_chunks(path, chunksize):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+        last = chunk.loc[[chunk.index.max()], MATCH_KEY]
+        open_rows = _lookup(chunk, last.assign(_open=True), '_open').notna().to_numpy()
+        carry = chunk[open_rows]
+        parts.append(_first_rows(chunk[~open_rows]))
+    if carry is not None:
+        parts.append(_first_rows(carry))
+
+    matches = pd.concat(parts, ignore_index=True)
+    split = matches.duplicated(MATCH_KEY, keep=False).to_numpy()
+    if split.any():
+        rows = match_rounds(path, matches.loc[split, MATCH_KEY], chunksize)
+        matches = pd.concat([matches[~split], _first_rows(rows)], ignore_index=True)
+    # aggregate_matches orders the whole sheet's matches by date, then by where each starts in the file.
+    matches = matches.sort_values('_first', kind='stable').drop(columns='_first')
+    return sort_by_date(matches.infer_objects(), ignore_index=True)
+
+
+def match_rounds(path: str, keys: pd.DataFrame, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """The round rows of the matches in `keys` (MATCH_KEY columns), from one chunked pass over the sheet."""
+    keys = keys[MATCH_KEY].drop_duplicates().assign(_hit=True)
+    rows = concat_compact([chunk[_lookup(chunk, keys, '_hit').notna().to_numpy()]
+                           for chunk in read_round_chunks(path, chunksize)])
+    return sort_by_date(rows)
+
+
+def _first_rows(rounds):
+    """aggregate_matches(rounds), with each match's first source row as `_first`."""
+    if rounds.empty:
+        return aggregate_matches(rounds).assign(_first=np.array([], dtype='int64'))
+    matches = aggregate_matches(rounds)
+    first = rounds.index.to_series().groupby([rounds[c] for c in MATCH_KEY], observed=True).min()
+    return matches.assign(_first=_lookup(matches, first.rename('_first').reset_index(), '_first').to_numpy())
@@ -0,0 +1,157 @@
+"""Synthetic scrim sheets shaped like the real CSVs, for benchmarks and scale tests.
+
+The three tables describe the same matches: every match in the round sheet gets a
+five-player block in form.csv (same map, date and result) and matching foracs.csv
+rows, so composition linking and tier filters behave as they do on real data.
+"""
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+MAPS = ['Ascent', 'Breeze', 'Fracture', 'Haven', 'Lotus', 'Pearl', 'Split', 'Summit', 'Sunset']
+THREE_SITE_MAPS = {'Haven', 'Lotus'}
+PLAYERS = ['splash', 'Erv', 'scales', 'xihe', 'slowly']
+# One agent pool per role slot, so blocks form plausible (and repeating) compositions.
+AGENT_POOLS = [
+    ['Jett', 'Raze', 'Neon', 'Yoru'],
+    ['Omen', 'Astra', 'Viper', 'Clove'],
+    ['Cypher', 'Killjoy', 'Sage', 'Vyse'],
+    ['Breach', 'Fade', 'Gekko', 'KAY/O'],
+    ['Sova', 'Skye', 'Tejo', 'Harbor'],
+]
+ROUNDS_PER_MATCH = 24
+
+
+def _clock(seconds):
+    """Seconds → 'M:SS' strings like the sheet's timer columns."""
+    seconds = np.asarray(seconds, dtype=int)
+    return [f"{s // 60}:{s % 60:02d}" for s in seconds]
+
+
+def generate_scrims(n_matches: int = 66, n_teams: int = 37, maps: list[str] = MAPS,
+                    start: date = date(2026, 5, 1), days: int = 60, tiered: float = 0.7,
+                    seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """(round sheet, form.csv, foracs.csv) frames for `n_matches` 24-round scrims.
+
+    `tiered` is the share of opponents with a Tier filled in; the rest are left blank
+    like the real sheet. Engagement/plant times, plant rate, site split and plant
+    win rates follow the distributions of the real round sheet.
+    """
+    rng = np.random.default_rng(seed)
+    teams = [f"TEAM {i:03d}" for i in range(n_teams)]
+    team_tier = np.where(rng.random(n_teams) < tiered, rng.integers(1, 4, n_teams).astype(float), np.nan)
+
+    # ── Matches ──────────────────────────────────────────────────────────────
+    # (Map, Team, Date) identifies a match, so draw distinct triples; stretch the
+    # calendar when asked for more matches than it can hold.
+    days = max(days, -(-2 * n_matches // (n_teams * len(maps))))
+    key = rng.choice(n_teams * len(maps) * days, n_matches, replace=False)
+    m_team, rest = key % n_teams, key // n_teams
+    m_map = np.asarray(maps)[rest % len(maps)]
+    m_date = np.array([start + timedelta(days=int(d)) for d in rest // len(maps)])
+    m_attack_first = rng.random(n_matches) < 0.5
+    m_strength = rng.normal(0, 0.08, n_matches)  # per-match edge, so outcomes aren't all coin flips
+
+    # ── Rounds ───────────────────────────────────────────────────────────────
+    n = n_matches * ROUNDS_PER_MATCH
+    match = np.repeat(np.arange(n_matches), ROUNDS_PER_MATCH)
+    rnd = np.tile(np.arange(1, ROUNDS_PER_MATCH + 1), n_matches)
+    attack = m_attack_first[match] == (rnd <= 12)
+
+    engage = np.clip(rng.normal(85, 14, n), 20, 100).round()
+    planted = rng.random(n) < 0.6
+    plant_at = np.clip(engage - rng.uniform(3, 35, n), 5, None).round()
+    three_sites = np.isin(m_map[match], list(THREE_SITE_MAPS))
+    site = np.where(three_sites, rng.choice(['A', 'B', 'C'], n, p=[0.45, 0.35, 0.2]),
+                    rng.choice(['A', 'B'], n, p=[0.58, 0.42]))
+
+    # Attackers convert most plants; defenders mostly win unplanted rounds.
+    p_win = np.where(planted, np.where(attack, 0.62, 0.38), np.where(attack, 0.3, 0.7)) + m_strength[match]
+    won = rng.random(n) < p_win
+    pistol = np.where(np.isin(rnd, [1, 13]), np.where(won, 'Win', 'Loss'), '')
+
+    rounds = pd.DataFrame({
+        'Map':                m_map[match],
+        'Team':               np.array(teams)[m_team][match],
+        'Round':              rnd,
+        'Side':               np.where(attack, 'Attack', 'Defence'),
+        'Time to engagement': _clock(engage),
+        'Time at Plant':      np.where(planted, _clock(plant_at), ''),
+        'Site':               np.where(planted, site, ''),
+        'Plant XvY':          np.where(planted, [f"{a}v{b}" for a, b in rng.integers(1, 6, (n, 2))], ''),
+        'Result':             np.where(won, 'Win', 'Loss'),
+        'Pistol':             pistol,
+        'Date':               [d.isoformat() for d in m_date[match]],
+        'Tier':               team_tier[m_team][match],
+    })
+
+    # ── Player rows (five per match) ─────────────────────────────────────────
+    wins = np.bincount(match, weights=won, minlength=n_matches)
+    outcome = np.select([wins > 12, wins < 12], ['Win', 'Loss'], 'Draw')
+    p = n_matches * 5
+    pm = np.repeat(np.arange(n_matches), 5)
+    slot = np.tile(np.arange(5), n_matches)
+    # Each map settles on one agent per slot most of the time, with occasional swaps.
+    map_pick = {m: rng.integers(0, 4, 5) for m in maps}
+    pick = np.array([map_pick[m][s] for m, s in zip(m_map[pm], slot)])
+    pick = np.where(rng.random(p) < 0.8, pick, rng.integers(0, 4, p))
+    agents = np.array([AGENT_POOLS[s][k] for s, k in zip(slot, pick)])
+
+    kills = rng.poisson(17, p)
+    deaths = rng.poisson(16, p)
+    assists = rng.poisson(6, p)
+    fk = rng.poisson(3, p)
+    fd = rng.poisson(2.5, p)
+    acs = np.clip(rng.normal(215, 45, p), 60, 420).round().astype(int)
+    # The real sheet mixes 05/22/2026 and 06-01-2026.
+    dates = [d.strftime('%m/%d/%Y' if k else '%m-%d-%Y') for d, k in zip(m_date[pm], rng.random(p) < 0.5)]
+    form = pd.DataFrame({
+        'Column 1':    m_map[pm],
+        'Player':      np.array(PLAYERS)[slot],
+        'Rounds':      ROUNDS_PER_MATCH,
+        'Kills':       kills,
+        'Deaths':      deaths,
+        'Assists':     assists,
+        'ACS':         acs,
+        'Agent':       agents,
+        'FK':          fk,
+        'Plants':      rng.poisson(1.5, p),
+        'Defuses':     rng.poisson(0.8, p),
+        'FD':          fd,
+        'FK+FD':       fk + fd,
+        'FBSR':        (fk / np.maximum(fk + fd, 1)).round(2),
+        'FKPR':        (fk / ROUNDS_PER_MATCH).round(2),
+        'KPR':         (kills / ROUNDS_PER_MATCH).round(2),
+        'Date':        dates,
+        'K+A PR':      ((kills + assists) / ROUNDS_PER_MATCH).round(2),
+        'Atk_Entry':   np.where(slot == 0, rng.uniform(0.3, 0.8, p).round(2), np.nan),
+        'Multi_Kills': rng.uniform(0, 0.4, p).round(2),
+        'Anchor_Time': np.where(slot == 2, rng.uniform(20, 70, p).round(1), np.nan),
+        'Result':      outcome[pm],
+    })
+    foracs = pd.DataFrame({
+        'Map':    form['Column 1'],
+        'Player': form['Player'],
+        'ACS':    form['ACS'],
+        'Agent':  form['Agent'],
+        'Date':   [d.isoformat() for d in m_date[pm]],
+        'Result': form['Result'],
+    })
+    return rounds, form, foracs
+
+
+def write_scrims(folder: str, n_matches: int = 66, **kwargs) -> dict[str, str]:
+    """Write the three synthetic CSVs under `folder` with the real file names; returns their paths."""
+    os.makedirs(folder, exist_ok=True)
+    paths = {
+        'rounds': os.path.join(folder, 'Advanced_Data-_Sheet1.csv'),
+        'form':   os.path.join(folder, 'form.csv'),
+        'foracs': os.path.join(folder, 'foracs.csv'),
+    }
+    for frame, path in zip(generate_scrims(n_matches, **kwargs), paths.values()):
+        frame.to_csv(path, index=False)
+    return paths
@@ -0,0 +1,92 @@
+"""Polling watcher over the source files, so a running server can reload them.
+
+    watcher = FileWatcher({"rounds": "Advanced_Data-_Sheet1.csv", "icons": "assets/agents"},
+                          on_change=lambda names: ...)
+    watcher.start()
+
+Every `interval` seconds each path's signature (size and mtime; for a folder, those
+of every entry but hidden ones such as a .scrim_cache) is compared with the last one acted on. A change is reported only
+after the signature has held still for `debounce` seconds, so an export that writes
+a file in several chunks triggers one reload. `on_change` gets the names of every
+path that settled in the same poll, on the watcher thread; `generation` then goes up
+by one so readers can tell a reload happened.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable
+
+log = logging.getLogger(__name__)
+
+
+def signature(path: str):
+    """(size, mtime_ns) of a file, the sorted (name, size, mtime_ns) of a folder's visible entries, or None if missing."""
+    try:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                return tuple(sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns)
+                                    for e in entries if not e.name.startswith('.')))
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class FileWatcher:
+    """Debounced polling watcher calling `on_change(names)` once per settled batch of changes."""
+
+    def __init__(self, paths: dict[str, str], on_change: Callable[[Iterable[str]], None],
+                 interval: float = 1.0, debounce: float = 2.0):
+        self.paths = dict(paths)
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self.generation = 0
+        self._seen = {name: signature(path) for name, path in self.paths.items()}
+        self._pending = {}  # name -> (signature, monotonic time it was first seen)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self, now: float | None = None) -> list[str]:
+        """Check every path once; returns (and reports) the names whose change has settled."""
+        now = time.monotonic() if now is None else now
+        settled = []
+        for name, path in self.paths.items():
+            sig = signature(path)
+            if sig == self._seen[name]:
+                self._pending.pop(name, None)  # changed and changed back
+                continue
+            pending = self._pending.get(name)
+            if pending is None or pending[0] != sig:
+                self._pending[name] = (sig, now)  # still being written: restart the clock
+            elif now - pending[1] >= self.debounce:
+                self._seen[name] = sig
+                del self._pending[name]
+                settled.append(name)
+        if settled:
+            try:
+                self.on_change(settled)
+            except Exception:
+                log.exception("reload after %s changed failed", ", ".join(settled))
+            self.generation += 1
+        return settled
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                log.exception("file watcher poll failed")
+
+    def start(self) -> FileWatcher:
+        """Poll on a daemon thread until stop()."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="scrim-file-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()